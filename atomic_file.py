@@ -0,0 +1,29 @@
+''' Writes files that other processes may have mapped, such as CompactTopology (main.py) and CatsTrie (q2.py) snapshots, without ever changing them in place. '''
+import os
+import tempfile
+from contextlib import contextmanager
+
+
+@contextmanager
+def atomic_write(path):
+    ''' Opens a temporary file next to path for binary writing and moves it over path once the block finishes.
+        A process that mapped the old file keeps reading the old file, and a reader opening path sees either the old file or the complete new one, never a half written one.
+        If the block raises, the temporary file is removed and path is left as it was.
+    :INPUT:
+        path: the file path to write to.
+    :OUTPUT: a binary file object to write the new contents to.
+    :TIME_COMPLEXITY: O(1) on top of the writes.
+    :SPACE_COMPLEXITY: O(1)
+    '''
+    path = os.fspath(path)
+    descriptor, temporary = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)), prefix='.%s.' % os.path.basename(path), suffix='.tmp')
+    try:
+        with os.fdopen(descriptor, 'wb') as file:
+            yield file
+
+        # mkstemp only lets the owner read the file; snapshots are meant to be mapped by other processes too
+        os.chmod(temporary, 0o644)
+        os.replace(temporary, path)
+    except BaseException:
+        os.unlink(temporary)
+        raise
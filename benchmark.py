@@ -0,0 +1,335 @@
+''' A reproducible benchmark suite for maxThroughput (main.py) and the CatsTrie variants (q2.py).
+
+Every input is generated from a seeded random.Random, so the same --seed and --scale always measure the same work.
+For every solver and every trie the suite reports build time, query latency percentiles, peak memory (traced separately so the timings are not slowed by it)
+and the algorithm counters the modules expose through instrumentation.set_instrumentation (collected in a run of their own, so they do not slow the timings either). Results are written as JSON, and --compare prints how they moved against an earlier run.
+
+Usage: python benchmark.py [--scale small|medium|large|huge] [--seed N] [--only flow|trie] [--solvers dinic,push_relabel] [-o results.json] [--compare baseline.json]
+'''
+import argparse
+import copy
+import json
+import platform
+import random
+import sys
+import time
+import tracemalloc
+from collections import Counter
+
+import instrumentation
+import main
+import q2
+
+
+# The sizes of every scale; small matches the connections1 example in main.py, huge reaches 10^6 channels
+SCALES = {
+    'small': {'data_centres': 240, 'channels': 270, 'queries': 50, 'sentences': 10000, 'vocabulary': 1000, 'prompts': 1000},
+    'medium': {'data_centres': 2000, 'channels': 10000, 'queries': 20, 'sentences': 100000, 'vocabulary': 10000, 'prompts': 2000},
+    'large': {'data_centres': 20000, 'channels': 100000, 'queries': 10, 'sentences': 1000000, 'vocabulary': 100000, 'prompts': 5000},
+    'huge': {'data_centres': 200000, 'channels': 1000000, 'queries': 3, 'sentences': 3000000, 'vocabulary': 300000, 'prompts': 5000},
+}
+
+# The reference 'dfs' solver needs a |D|×|D| matrix, so it only runs up to this many data centres
+REFERENCE_LIMIT = 2000
+
+TOPOLOGIES = ('random', 'chain', 'ring', 'grid', 'layered')
+
+
+def random_topology(data_centres, channels, rng):
+    ''' Returns (connections, maxIn, maxOut) with channels drawn uniformly between random data centres; capacities and limits follow the ranges of the connections1 example. '''
+    connections = [(rng.randrange(data_centres), rng.randrange(data_centres), rng.randint(50, 800)) for _ in range(channels)]
+    maxIn = [rng.randint(500, 2160) for _ in range(data_centres)]
+    maxOut = [rng.randint(500, 1770) for _ in range(data_centres)]
+    return connections, maxIn, maxOut
+
+def structured_topology(kind, data_centres, channels, rng):
+    ''' Returns (connections, maxIn, maxOut) for a structured network.
+    :INPUT:
+        kind: 'chain' (one long path, the deepest augmenting paths), 'ring' (a bidirectional replication ring),
+              'grid' (a square mesh, right and down) or 'layered' (a WAN backbone; every data centre links to random ones in the next layer).
+        data_centres: an integer reflecting the number of data centres.
+        channels: an integer reflecting the approximate number of channels; only 'layered' uses it, the other shapes are fixed by their size.
+        rng: a random.Random to draw capacities and links from.
+    :OUTPUT: a tuple (connections, maxIn, maxOut).
+    '''
+    connections = []
+    if kind == 'chain':
+        connections = [(centre, centre + 1, rng.randint(50, 800)) for centre in range(data_centres - 1)]
+    elif kind == 'ring':
+        for centre in range(data_centres):
+            connections.append((centre, (centre + 1) % data_centres, rng.randint(50, 800)))
+            connections.append(((centre + 1) % data_centres, centre, rng.randint(50, 800)))
+    elif kind == 'grid':
+        side = max(1, int(data_centres ** 0.5))
+        for row in range(side):
+            for column in range(side):
+                centre = row * side + column
+                if column + 1 < side:
+                    connections.append((centre, centre + 1, rng.randint(50, 800)))
+                if row + 1 < side:
+                    connections.append((centre, centre + side, rng.randint(50, 800)))
+    elif kind == 'layered':
+        layers = max(2, int(data_centres ** 0.5))
+        width = max(1, data_centres // layers)
+        per_node = max(1, channels // data_centres)
+        for layer in range(layers - 1):
+            for offset in range(width):
+                centre = layer * width + offset
+                for _ in range(per_node):
+                    connections.append((centre, (layer + 1) * width + rng.randrange(width), rng.randint(50, 800)))
+    else:
+        raise ValueError("unknown topology %r; expected one of %s" % (kind, ', '.join(TOPOLOGIES)))
+
+    maxIn = [rng.randint(500, 2160) for _ in range(data_centres)]
+    maxOut = [rng.randint(500, 1770) for _ in range(data_centres)]
+    return connections, maxIn, maxOut
+
+def flow_queries(kind, data_centres, count, rng):
+    ''' Returns count (origin, targets) queries; end to end for the chain, random data centres otherwise. '''
+    if kind == 'chain':
+        return [(0, [data_centres - 1])] * count
+    return [(rng.randrange(data_centres), rng.sample(range(data_centres), min(data_centres, rng.randint(1, 5)))) for _ in range(count)]
+
+def zipf_corpus(sentences, vocabulary, rng, exponent=1.1, alphabet='abcdefghijklmnopqrstuvwxyz'):
+    ''' Returns (corpus, distinct); a corpus of sentences whose frequencies follow a Zipf distribution over vocabulary distinct sentences.
+    :INPUT:
+        sentences: an integer reflecting the number of sentences in the corpus.
+        vocabulary: an integer reflecting the number of distinct sentences to draw from.
+        rng: a random.Random to draw from.
+        exponent: the Zipf exponent; the sentence of rank r is drawn with weight 1 / r ** exponent.
+        alphabet: the characters sentences are made of.
+    :OUTPUT: a tuple (corpus, distinct) of two lists of strings.
+    '''
+    distinct = list({''.join(rng.choice(alphabet) for _ in range(rng.randint(3, 40))) for _ in range(vocabulary)})
+    rng.shuffle(distinct)
+
+    cumulative = []
+    total = 0.0
+    for rank in range(1, len(distinct) + 1):
+        total += 1.0 / rank ** exponent
+        cumulative.append(total)
+    return rng.choices(distinct, cum_weights=cumulative, k=sentences), distinct
+
+def trie_prompts(corpus, count, rng):
+    ''' Returns count prompts; prefixes of random length of sentences drawn from the corpus, so popular sentences are prompted for more often. '''
+    return [sentence[:rng.randint(1, len(sentence))] for sentence in rng.choices(corpus, k=count)]
+
+def percentiles(samples):
+    ''' Returns the nearest-rank p50, p90 and p99 together with the mean and maximum of a list of seconds. '''
+    ordered = sorted(samples)
+    if not ordered:
+        return {}
+
+    def rank(fraction):
+        return ordered[min(len(ordered) - 1, max(0, int(round(fraction * len(ordered))) - 1))]
+
+    return {'p50': rank(0.50), 'p90': rank(0.90), 'p99': rank(0.99), 'mean': sum(ordered) / len(ordered), 'max': ordered[-1], 'count': len(ordered)}
+
+def measure(build, queries, solve, counters, prepare=None):
+    ''' Times build() once and solve(built, query) for every query with the counters off, then traces the peak memory of a second build and first solve,
+        and finally repeats the whole run with the counters on if they were asked for.
+    :INPUT:
+        build: a function with no arguments returning the built structure.
+        queries: a list of queries.
+        solve: a function taking the built structure and one query.
+        counters: True to collect the instrumentation counters in a separate, untimed run.
+        prepare: None, or a function taking the built structure and returning what solve should be given for the next query; called before every query, outside the timing.
+    :OUTPUT: a dictionary of build_seconds, latency_seconds, peak_memory_bytes and counters.
+    '''
+    if prepare is None:
+        prepare = lambda built: built
+
+    started = time.perf_counter()
+    built = build()
+    build_seconds = time.perf_counter() - started
+
+    latencies = []
+    for query in queries:
+        working = prepare(built)
+        started = time.perf_counter()
+        solve(working, query)
+        latencies.append(time.perf_counter() - started)
+        del working
+    del built
+
+    # Traced separately; tracemalloc slows every allocation down too much to time under it
+    tracemalloc.start()
+    try:
+        built = build()
+        if queries:
+            solve(prepare(built), queries[0])
+        peak_memory = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    del built
+
+    # Counted separately as well; the counters cost time of their own
+    tally = Counter()
+    if counters:
+        instrumentation.set_instrumentation(tally)
+        try:
+            built = build()
+            for query in queries:
+                solve(prepare(built), query)
+        finally:
+            instrumentation.set_instrumentation(None)
+
+    return {
+        'build_seconds': build_seconds,
+        'latency_seconds': percentiles(latencies),
+        'peak_memory_bytes': peak_memory,
+        'counters': dict(tally),
+    }
+
+def flow_engines(topology, solvers):
+    ''' Returns (name, build, solve, prepare) for every requested maximum flow engine; see measure. '''
+    connections, maxIn, maxOut = topology
+    engines = []
+    for solver in solvers:
+        if solver == 'dfs':
+            if len(maxIn) > REFERENCE_LIMIT:
+                continue
+
+            # The reference solver writes into the matrix, so every query gets its own copy of it, made before the timing starts
+            def solve(matrix, query):
+                origin, targets = query
+                main.link_targets_to_additional(matrix, targets, maxIn, maxOut)
+                return main.calculate_maximum_flow(matrix, origin)
+            engines.append(('dfs', lambda: main.initialise_adjacency_matrix(len(maxIn), connections, maxIn, maxOut), solve, copy.deepcopy))
+        elif solver == 'dinic_csr':
+            engines.append(('dinic_csr', lambda: main.CompactTopology.from_connections(connections, maxIn, maxOut),
+                            lambda compact, query: main.dinic_csr(compact, query[0], query[1]), None))
+        else:
+            engines.append((solver, lambda: main.initialise_base_graph(len(maxIn), connections, maxIn, maxOut),
+                            lambda base, query, solver=solver: main.solve_on_base(base, query[0], query[1], solver), None))
+    return engines
+
+def run_flow(scale, seed, solvers, counters):
+    ''' Runs every solver on every topology shape at the given scale; returns a list of result dictionaries. '''
+    sizes = SCALES[scale]
+    results = []
+    for kind in TOPOLOGIES:
+        rng = random.Random('%s-%s-%s' % (seed, scale, kind))
+        if kind == 'random':
+            topology = random_topology(sizes['data_centres'], sizes['channels'], rng)
+        else:
+            topology = structured_topology(kind, sizes['data_centres'], sizes['channels'], rng)
+        queries = flow_queries(kind, sizes['data_centres'], sizes['queries'], rng)
+
+        for name, build, solve, prepare in flow_engines(topology, solvers):
+            result = {'benchmark': 'flow', 'input': kind, 'implementation': name, 'data_centres': len(topology[1]), 'channels': len(topology[0])}
+
+            # The recursive reference solver cannot follow paths deeper than the recursion limit; record that rather than stop the suite
+            try:
+                result.update(measure(build, queries, solve, counters, prepare))
+            except RecursionError as error:
+                result['error'] = 'RecursionError: %s' % error
+                print('%-6s %-10s %-32s %s' % ('flow', kind, name, result['error']), file=sys.stderr)
+            else:
+                _progress(result)
+            results.append(result)
+    return results
+
+def run_trie(scale, seed, counters):
+    ''' Runs every trie variant on a Zipf corpus at the given scale; returns a list of result dictionaries. '''
+    sizes = SCALES[scale]
+    rng = random.Random('%s-%s-corpus' % (seed, scale))
+    corpus, distinct = zipf_corpus(sizes['sentences'], sizes['vocabulary'], rng)
+    prompts = trie_prompts(corpus, sizes['prompts'], rng)
+
+    variants = [
+        ('CatsTrie', lambda: q2.CatsTrie(corpus), lambda trie, prompt: trie.autoComplete(prompt)),
+        ('CatsTrie(bulk=False)', lambda: q2.CatsTrie(corpus, bulk=False), lambda trie, prompt: trie.autoComplete(prompt)),
+        ('CatsTrie.autoComplete_topk(5)', lambda: q2.CatsTrie(corpus), lambda trie, prompt: trie.autoComplete_topk(prompt, 5)),
+        ('CompactCatsTrie', lambda: q2.CompactCatsTrie(corpus), lambda trie, prompt: trie.autoComplete(prompt)),
+        ('RadixCatsTrie', lambda: q2.RadixCatsTrie(corpus), lambda trie, prompt: trie.autoComplete(prompt)),
+    ]
+
+    results = []
+    for name, build, solve in variants:
+        result = {'benchmark': 'trie', 'input': 'zipf', 'implementation': name, 'sentences': len(corpus), 'distinct_sentences': len(distinct)}
+        result.update(measure(build, prompts, solve, counters))
+        results.append(result)
+        _progress(result)
+    return results
+
+def compare(results, baseline):
+    ''' Prints how build time, median latency and peak memory moved against a baseline run; ratios above 1 are slower or bigger. '''
+    previous = {(result['benchmark'], result['input'], result['implementation']): result for result in baseline['results']}
+    print('%-6s %-10s %-32s %10s %10s %10s' % ('bench', 'input', 'implementation', 'build', 'p50', 'memory'), file=sys.stderr)
+    for result in results:
+        key = (result['benchmark'], result['input'], result['implementation'])
+        if key not in previous or 'error' in result or 'error' in previous[key]:
+            continue
+        before = previous[key]
+        ratios = [
+            _ratio(result['build_seconds'], before['build_seconds']),
+            _ratio(result['latency_seconds'].get('p50'), before['latency_seconds'].get('p50')),
+            _ratio(result['peak_memory_bytes'], before['peak_memory_bytes']),
+        ]
+        print('%-6s %-10s %-32s %10s %10s %10s' % (key + tuple(ratios)), file=sys.stderr)
+
+def _ratio(now, before):
+    ''' Formats now / before, or '-' when either is missing or zero. '''
+    if not now or not before:
+        return '-'
+    return '%.2fx' % (now / before)
+
+def _progress(result):
+    ''' Prints a one line summary of a finished benchmark to stderr. '''
+    print('%-6s %-10s %-32s build %.4fs  p50 %.6fs  peak %d KiB' % (
+        result['benchmark'], result['input'], result['implementation'], result['build_seconds'],
+        result['latency_seconds'].get('p50', 0.0), result['peak_memory_bytes'] // 1024), file=sys.stderr)
+
+def main_cli(argv=None):
+    ''' Command line entry point; see the module docstring. '''
+    parser = argparse.ArgumentParser(description='Benchmark maxThroughput and the CatsTrie variants.')
+    parser.add_argument('--scale', default='small', choices=sorted(SCALES), help='input sizes (default small)')
+    parser.add_argument('--seed', type=int, default=0, help='seed for every generator (default 0)')
+    parser.add_argument('--only', choices=('flow', 'trie'), help='run just one of the two suites')
+    parser.add_argument('--solvers', default=','.join(['dfs'] + sorted(main.SOLVERS) + ['dinic_csr']),
+                        help='comma separated maximum flow engines (default all; dfs is skipped above %d data centres)' % REFERENCE_LIMIT)
+    parser.add_argument('--no-counters', action='store_true', help='skip the extra run that collects the instrumentation counters')
+    parser.add_argument('-o', '--output', default='-', help='result file; - for stdout (default)')
+    parser.add_argument('--compare', help='an earlier result file to compare against')
+    arguments = parser.parse_args(argv)
+
+    solvers = [solver for solver in arguments.solvers.split(',') if solver]
+    for solver in solvers:
+        if solver not in main.SOLVERS and solver not in ('dfs', 'dinic_csr'):
+            parser.error('unknown solver %r' % solver)
+
+    results = []
+    if arguments.only in (None, 'flow'):
+        results += run_flow(arguments.scale, arguments.seed, solvers, not arguments.no_counters)
+    if arguments.only in (None, 'trie'):
+        results += run_trie(arguments.scale, arguments.seed, not arguments.no_counters)
+
+    report = {
+        'meta': {
+            'scale': arguments.scale,
+            'seed': arguments.seed,
+            'sizes': SCALES[arguments.scale],
+            'python': platform.python_version(),
+            'implementation': platform.python_implementation(),
+            'machine': platform.machine(),
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+        },
+        'results': results,
+    }
+
+    text = json.dumps(report, indent=2)
+    if arguments.output == '-':
+        print(text)
+    else:
+        with open(arguments.output, 'w') as file:
+            file.write(text + '\n')
+
+    if arguments.compare:
+        with open(arguments.compare) as file:
+            compare(results, json.load(file))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main_cli())
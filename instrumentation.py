@@ -0,0 +1,23 @@
+''' Counters of the work the maximum flow solvers (main.py) and the tries (q2.py) do, such as augmenting paths found or nodes created.
+Counting is off unless set_instrumentation is given somewhere to count into. The instrumented code tallies its work in local variables and only hands it over when a call returns,
+so with counting off the only cost is one check per call.
+'''
+
+# Where the counts are added; None (the default) turns counting off
+counters = None
+
+def set_instrumentation(new_counters):
+    ''' Turns the counters on or off.
+    :INPUT:
+        new_counters: a collections.Counter (or any mapping where a missing name counts as 0) to add the counts to; None to turn counting off.
+    :OUTPUT: No Direct Return Output
+    :TIME_COMPLEXITY: O(1)
+    :SPACE_COMPLEXITY: O(1)
+    '''
+    global counters
+    counters = new_counters
+
+def record(**counts):
+    ''' Adds counts to the counters; callers check that counters is not None first. '''
+    for name, count in counts.items():
+        counters[name] += count
@@ -1,4 +1,14 @@
-def maxThroughput(connections, maxIn, maxOut, origin, targets):
+import array
+import mmap as mmap_module
+import struct
+import sys
+from multiprocessing import get_context, shared_memory
+
+import instrumentation
+from atomic_file import atomic_write
+
+
+def maxThroughput(connections, maxIn, maxOut, origin, targets, solver='dinic'):
     ''' A Driver method to Calculate and return the maximum possible data throughput from the data centre origin to the data centres specified in targets.
     :INPUT:
         connections: a list of tuple elements (a, b, t) where:
@@ -10,15 +20,30 @@ def maxThroughput(connections, maxIn, maxOut, origin, targets):
         origin: an integer ID origin ∈ {0, 1, . . . , |D| − 1} of the data centre where the data to be backed up is located; start source.
         targets: a list of targets of data centres that are deemed appropriate locations for the backup data to be stored; 
                  a list of integers such that each integer i in it is such that i ∈ {0, 1, . . . , |D| − 1} and indicates that backing up data to server i is fine.
+        solver: the name of the maximum flow engine to use; 'dfs' or one of the keys of SOLVERS.
+                'dinic', 'push_relabel', 'iterative_dfs' and 'capacity_scaling' run on a sparse residual graph; 'dfs' is the original adjacency matrix depth-first search kept as a reference mode.
     :OUTPUT: maximum_flow; an integer reflecting the maximum possible data throughput from the data centre origin to the data centres specified in targets.
-    :TIME_COMPLEXITY: O(|D| · |C|^2) with |D| data centres and |C| communication channels.
-    :SPACE_COMPLEXITY: O(1)
+    :TIME_COMPLEXITY: O(|D|^2 · |C|) for 'dinic' and O(|D|^2 · sqrt(|C|)) for 'push_relabel'; the 'dfs' reference mode is O(|D|^2 · F) where F is the maximum flow.
+    :SPACE_COMPLEXITY: O(|D| + |C|) for the sparse solvers; O(|D|^2) for the 'dfs' reference mode.
     '''
+    # Look up the requested engine up front so that a misspelt solver name fails before any graph is built
+    if solver != 'dfs' and solver not in SOLVERS:
+        raise ValueError("unknown solver %r; expected 'dfs' or one of %s" % (solver, ', '.join(sorted(SOLVERS))))
 
     # Store the number of data centres into its own reusable variable
     # Represents the number of data centres in the network
     number_of_data_centres = len(maxIn)
 
+    # A negative origin would otherwise index the additional sink node and leave the solvers looking for a path from the sink to itself
+    if not 0 <= origin < number_of_data_centres:
+        raise IndexError("origin data centre %r does not exist" % (origin,))
+
+    # The sparse engines share one residual graph layout; only the original reference mode still needs the dense adjacency matrix
+    if solver != 'dfs':
+        graph = initialise_residual_graph(number_of_data_centres, connections, maxIn, maxOut)
+        sink = link_targets_to_sink(graph, targets, maxIn, maxOut)
+        return SOLVERS[solver](graph, origin, sink)
+
     # Call upon our helper method to initialise an adjacency matrix structure such that every cell in the matrix presents its own maximum possible flow that can be sent from and through that data centre cell
     # This data structure will help us represent the network structure with respect to the maximum flow capacitiy property between every data centre
     adjacency_matrix = initialise_adjacency_matrix(number_of_data_centres, connections, maxIn, maxOut)
@@ -130,6 +155,8 @@ def calculate_maximum_flow(adjacency_matrix, origin):
     '''
     # Initialise a recording variable that tracks the ongoing total flow of data that can be sent from the origin to all target data centres in the network.
     maximum_flow = 0
+    searches = 0
+    nodes_visited = 0
 
     while True:
 
@@ -139,6 +166,11 @@ def calculate_maximum_flow(adjacency_matrix, origin):
 
         # Create a flow variable that equates to the value returned by performing a depth-first search in endeavour to find a path from the origin to the additional node
         flow = dfs(origin, float('inf'), adjacency_matrix, visited)
+        searches += 1
+
+        # Every data centre the search reached is marked in visited; only worth counting when someone is looking
+        if instrumentation.counters is not None:
+            nodes_visited += visited.count(True)
 
         # Should this flow equate to 0; then no path was found; break our while loop as we have found all paths from the origin to that of the additional node
         if flow == 0:
@@ -147,27 +179,1096 @@ def calculate_maximum_flow(adjacency_matrix, origin):
         # Otherwise if a path was discovered; increment its flow to the total ongoing flow of the network; this flow represents the maximum data flow that can be sent from the origin to that of all target data centres through this path within the network
         maximum_flow += flow
 
+    # Every search but the last one found a path
+    if instrumentation.counters is not None:
+        instrumentation.record(dfs_searches=searches, dfs_nodes_visited=nodes_visited, augmenting_paths=searches - 1)
+
     # Return the maximum flow
     return maximum_flow
 
 
-# Example
-connections = [(0, 1, 3000), (1, 2, 2000), (1, 3, 1000), (0, 3, 2000), (3, 4, 2000), (3, 2, 1000)]
-maxIn = [5000, 3000, 3000, 3000, 2000]
-maxOut = [5000, 3000, 3000, 2500, 1500]
-origin = 0
-targets = [4, 2]
-# Your function should return the maximum possible data throughput from the
-# data centre origin to the data centres specified in targets.
-print(maxThroughput(connections, maxIn, maxOut, origin, targets))
-#4500
+class ResidualGraph:
+    ''' A sparse residual graph class that stores the network as adjacency lists of edge ids rather than as a |D|×|D| matrix.
+        Every channel is stored as a pair of edges; an edge e and its reverse edge e ^ 1 always sit next to each other so that pushing flow along one hands residual capacity back to the other.
+    '''
+
+    def __init__(self, number_of_nodes):
+        ''' Initialises our instance variables for an empty residual graph
+        :INPUT:
+            number_of_nodes: an integer reflecting the number of nodes the graph starts with.
+        :OUTPUT: No Direct Return Output
+        :TIME_COMPLEXITY: O(|V|), where |V| is the number of nodes.
+        :SPACE_COMPLEXITY: O(|V|), where |V| is the number of nodes.
+        '''
+        self.adjacency = [[] for _ in range(number_of_nodes)]  # adjacency[u] holds the ids of every edge leaving node u, reverse edges included.
+        self.edge_to = []  # edge_to[e] is the node that edge e arrives at.
+        self.capacity = []  # capacity[e] is the capacity edge e was created with; always 0 for reverse edges.
+        self.residual = []  # residual[e] is the capacity still left on edge e.
+        self.shared = False  # True for a copy; its adjacency lists, edge_to and capacity belong to the graph it was copied from.
+
+    def copy(self):
+        ''' Creates a copy of the graph, carrying no flow, for a single solve.
+            Only the residual capacities are copied since they are all a solve writes to; the adjacency lists, edge_to and capacity stay shared with this graph, so no nodes or edges can be added to the copy.
+        :INPUT: No Direct Input
+        :OUTPUT: graph; a ResidualGraph whose flow can be changed without affecting this one.
+        :TIME_COMPLEXITY: O(|E|), where |E| is the number of edges.
+        :SPACE_COMPLEXITY: O(|E|), where |E| is the number of edges.
+        '''
+        graph = ResidualGraph(0)
+        graph.adjacency = self.adjacency
+        graph.edge_to = self.edge_to
+        graph.capacity = self.capacity
+        graph.residual = list(self.capacity)
+        graph.shared = True
+        return graph
+
+    def add_node(self):
+        ''' Adds a new node with no edges to the graph.
+        :INPUT: No Direct Input
+        :OUTPUT: node; the integer ID of the newly created node.
+        :TIME_COMPLEXITY: O(1)
+        :SPACE_COMPLEXITY: O(1)
+        '''
+        if self.shared:
+            raise TypeError("a copied graph shares its structure with the graph it was copied from and cannot be extended")
+        self.adjacency.append([])
+        return len(self.adjacency) - 1
+
+    def add_edge(self, from_node, to_node, capacity):
+        ''' Adds an edge together with its reverse edge to the graph.
+        :INPUT:
+            from_node: the integer ID of the node the edge departs from.
+            to_node: the integer ID of the node the edge arrives at.
+            capacity: a non-negative integer reflecting the maximum flow the edge can carry.
+        :OUTPUT: edge; the integer ID of the forward edge; its reverse edge is edge ^ 1.
+        :TIME_COMPLEXITY: O(1)
+        :SPACE_COMPLEXITY: O(1)
+        '''
+        if self.shared:
+            raise TypeError("a copied graph shares its structure with the graph it was copied from and cannot be extended")
+        edge = len(self.edge_to)
+
+        # The forward edge starts with its full capacity available
+        self.adjacency[from_node].append(edge)
+        self.edge_to.append(to_node)
+        self.capacity.append(capacity)
+        self.residual.append(capacity)
+
+        # The reverse edge starts empty; it only gains residual capacity once flow is pushed along the forward edge
+        self.adjacency[to_node].append(edge + 1)
+        self.edge_to.append(from_node)
+        self.capacity.append(0)
+        self.residual.append(0)
+
+        return edge
+
+
+def initialise_residual_graph(number_of_data_centres, connections, maxIn, maxOut):
+    ''' A helper method to initialise a sparse residual graph from the given connections.
+    :INPUT:
+        number_of_data_centres: an integer reflecting the number of data centres.
+        connections: a list of tuple elements (a, b, t) as described in maxThroughput.
+        maxIn:  a list of integers in which maxIn[i] specifies the maximum amount of incoming data that data centre i can process per second.
+        maxOut: a list of integers in which maxOut[i] specifies the maximum amount of outgoing data that data centre i can process per second.
+    :OUTPUT: graph; a ResidualGraph with one node per data centre and one edge pair per distinct channel.
+    :TIME_COMPLEXITY: O(|D| + |C|), where |D| is the number of data centres and |C| is the number of connections.
+    :SPACE_COMPLEXITY: O(|D| + |C|), where |D| is the number of data centres and |C| is the number of connections.
+    '''
+    # The adjacency matrix keeps the last capacity given for a pair of data centres, so collapse repeated channels the same way to keep every solver in agreement
+    # Channels from a data centre to itself can never lie on an augmenting path so they are left out entirely
+    channel_capacities = {}
+    for from_centre, to_centre, flow in connections:
+        if from_centre != to_centre:
+            channel_capacities[(from_centre, to_centre)] = min(flow, maxOut[from_centre], maxIn[to_centre])
+
+    # Now populate the graph with an edge pair for every remaining channel
+    graph = ResidualGraph(number_of_data_centres)
+    for (from_centre, to_centre), capacity in channel_capacities.items():
+        graph.add_edge(from_centre, to_centre, capacity)
+
+    return graph
+
+def link_targets_to_sink(graph, targets, maxIn, maxOut):
+    ''' A method to create an additional sink node in the residual graph and connect every target data centre to it.
+    :INPUT:
+        graph: a ResidualGraph as created by initialise_residual_graph.
+        targets: a list of integers reflecting the target data centres.
+        maxIn:  a list of integers in which maxIn[i] specifies the maximum amount of incoming data that data centre i can process per second.
+        maxOut: a list of integers in which maxOut[i] specifies the maximum amount of outgoing data that data centre i can process per second.
+    :OUTPUT: sink; the integer ID of the newly created sink node.
+    :TIME_COMPLEXITY: O(|T|), where |T| is the number of target data centres.
+    :SPACE_COMPLEXITY: O(|T|), where |T| is the number of target data centres.
+    '''
+    sink = graph.add_node()
+
+    # A target listed more than once is still only a single place to back up to, so it only gets linked once
+    for centre_target in dict.fromkeys(targets):
+        graph.add_edge(centre_target, sink, min(maxIn[centre_target], maxOut[centre_target]))
+
+    return sink
+
+def initialise_base_graph(number_of_data_centres, connections, maxIn, maxOut):
+    ''' A helper method to initialise a residual graph that many queries can solve on, whatever their targets.
+        The additional sink node is added straight away with an edge to it from every data centre; a query only opens the edges of its own targets (see solve_on_base), so no query ever has to add an edge.
+    :INPUT:
+        number_of_data_centres: an integer reflecting the number of data centres.
+        connections: a list of tuple elements (a, b, t) as described in maxThroughput.
+        maxIn:  a list of integers in which maxIn[i] specifies the maximum amount of incoming data that data centre i can process per second.
+        maxOut: a list of integers in which maxOut[i] specifies the maximum amount of outgoing data that data centre i can process per second.
+    :OUTPUT: graph; a ResidualGraph whose last node is the sink and whose last |D| edge pairs link data centre 0, 1, ... to it.
+    :TIME_COMPLEXITY: O(|D| + |C|), where |D| is the number of data centres and |C| is the number of connections.
+    :SPACE_COMPLEXITY: O(|D| + |C|), where |D| is the number of data centres and |C| is the number of connections.
+    '''
+    graph = initialise_residual_graph(number_of_data_centres, connections, maxIn, maxOut)
+    sink = graph.add_node()
+    for centre in range(number_of_data_centres):
+        graph.add_edge(centre, sink, min(maxIn[centre], maxOut[centre]))
+    return graph
+
+def dinic(graph, source, sink):
+    ''' Dinic's maximum flow algorithm on a sparse residual graph.
+        Each phase builds a BFS level graph and then saturates it with a blocking flow; the blocking flow search walks an explicit path with a current-arc pointer per node so that no edge is rescanned within a phase.
+    :INPUT:
+        graph: a ResidualGraph; its residual capacities are updated in place.
+        source: the integer ID of the node the flow leaves from.
+        sink: the integer ID of the node the flow arrives at.
+    :OUTPUT: maximum_flow; an integer reflecting the flow added from source to sink on top of whatever flow the graph already carried.
+    :TIME_COMPLEXITY: O(|V|^2 · |E|), where |V| is the number of nodes and |E| is the number of edges.
+    :SPACE_COMPLEXITY: O(|V|), where |V| is the number of nodes.
+    '''
+    adjacency = graph.adjacency
+    edge_to = graph.edge_to
+    residual = graph.residual
+    number_of_nodes = len(adjacency)
+    maximum_flow = 0
+    phases = 0
+    paths = 0
+
+    while True:
+
+        # Build the level graph; level[v] is the BFS distance of v from the source over edges that still have residual capacity
+        level = [-1] * number_of_nodes
+        level[source] = 0
+        queue = [source]
+        for node in queue:
+
+            # Nothing at or beyond the level of the sink can lie on a shortest path to it
+            if level[sink] >= 0 and level[node] >= level[sink]:
+                break
+            next_level = level[node] + 1
+            for edge in adjacency[node]:
+                neighbour = edge_to[edge]
+                if residual[edge] > 0 and level[neighbour] < 0:
+                    level[neighbour] = next_level
+                    queue.append(neighbour)
+
+        # Once the sink can no longer be reached every augmenting path has been used up
+        if level[sink] < 0:
+            break
+        phases += 1
+
+        # pointer[u] is the position in adjacency[u] of the first edge that may still lead to the sink during this phase
+        pointer = [0] * number_of_nodes
+        path = []
+        node = source
+
+        while True:
+
+            # Reached the sink; push the bottleneck of the path along it and restart the walk from the source
+            if node == sink:
+                bottleneck = min([residual[edge] for edge in path])
+                for edge in path:
+                    residual[edge] -= bottleneck
+                    residual[edge ^ 1] += bottleneck
+                maximum_flow += bottleneck
+                paths += 1
+                path = []
+                node = source
+                continue
+
+            # Advance along the first admissible edge; an edge is admissible when it still has residual capacity and moves exactly one level closer to the sink
+            edges = adjacency[node]
+            index = pointer[node]
+            next_level = level[node] + 1
+            while index < len(edges):
+                edge = edges[index]
+                if residual[edge] > 0 and level[edge_to[edge]] == next_level:
+                    break
+                index += 1
+            pointer[node] = index
+
+            if index < len(edges):
+                path.append(edges[index])
+                node = edge_to[edges[index]]
+                continue
+
+            # A dead end; the source being a dead end means the level graph is saturated
+            if node == source:
+                break
+
+            # Otherwise take the node out of the level graph, step back and move the parent past the edge we came through
+            level[node] = -1
+            edge = path.pop()
+            node = edge_to[edge ^ 1]
+            pointer[node] += 1
+
+    if instrumentation.counters is not None:
+        instrumentation.record(dinic_phases=phases, augmenting_paths=paths)
+    return maximum_flow
+
+def push_relabel(graph, source, sink):
+    ''' Highest-label push-relabel maximum flow algorithm on a sparse residual graph.
+        Only the first phase of the algorithm is run; it finds a maximum preflow, whose excess at the sink is already the maximum flow, so surplus is never walked back to the source.
+        Active nodes are discharged highest first. Heights are recomputed exactly by a reverse BFS from the sink at the start and again after every |V| relabels (global relabelling),
+        and every height keeps a linked list of its nodes so that when a height empties (a gap) only the nodes above it are lifted out of the search.
+    :INPUT:
+        graph: a ResidualGraph; its residual capacities are updated in place and are left holding a maximum preflow rather than a flow.
+        source: the integer ID of the node the flow leaves from.
+        sink: the integer ID of the node the flow arrives at.
+    :OUTPUT: maximum_flow; an integer reflecting the flow added from source to sink on top of whatever flow the graph already carried.
+    :TIME_COMPLEXITY: O(|V|^2 · sqrt(|E|)) pushes and relabels in the worst case; every global relabel costs O(|V| + |E|) and runs at most once per |V| relabels.
+    :SPACE_COMPLEXITY: O(|V|), where |V| is the number of nodes.
+    '''
+    adjacency = graph.adjacency
+    edge_to = graph.edge_to
+    residual = graph.residual
+    number_of_nodes = len(adjacency)
+
+    height = [number_of_nodes] * number_of_nodes
+    excess = [0] * number_of_nodes
+    pointer = [0] * number_of_nodes
+    active = [[] for _ in range(number_of_nodes)]  # active[h] holds the nodes at height h with excess; entries left behind by a gap or a relabel are skipped when popped.
+    layer_head = [-1] * number_of_nodes  # layer_head[h] is the first node of the doubly linked list of every node at height h.
+    layer_next = [-1] * number_of_nodes
+    layer_previous = [-1] * number_of_nodes
+    pushes = 0
+    relabels = 0
+
+    def add_to_layer(node, level):
+        layer_previous[node] = -1
+        layer_next[node] = layer_head[level]
+        if layer_head[level] >= 0:
+            layer_previous[layer_head[level]] = node
+        layer_head[level] = node
+
+    def remove_from_layer(node, level):
+        if layer_previous[node] >= 0:
+            layer_next[layer_previous[node]] = layer_next[node]
+        else:
+            layer_head[level] = layer_next[node]
+        if layer_next[node] >= 0:
+            layer_previous[layer_next[node]] = layer_previous[node]
+
+    def global_relabel():
+        ''' Resets every height to the exact residual distance to the sink and rebuilds the layers and active lists; returns (highest active, highest layer). '''
+        for level in range(number_of_nodes):
+            layer_head[level] = -1
+            active[level] = []
+        for node in range(number_of_nodes):
+            height[node] = number_of_nodes
+            pointer[node] = 0
+
+        height[sink] = 0
+        queue = [sink]
+        for node in queue:
+            next_height = height[node] + 1
+            for edge in adjacency[node]:
+                neighbour = edge_to[edge]
+                if height[neighbour] == number_of_nodes and neighbour != source and residual[edge ^ 1] > 0:
+                    height[neighbour] = next_height
+                    queue.append(neighbour)
+
+        # Nodes that can no longer reach the sink keep height |V| and drop out of the search
+        highest_active = -1
+        highest_layer = 0
+        for node in queue[1:]:
+            level = height[node]
+            add_to_layer(node, level)
+            highest_layer = max(highest_layer, level)
+            if excess[node] > 0:
+                active[level].append(node)
+                highest_active = max(highest_active, level)
+        return highest_active, highest_layer
+
+    # Saturate every edge leaving the source to create the initial preflow
+    for edge in adjacency[source]:
+        flow = residual[edge]
+        if flow > 0:
+            residual[edge] = 0
+            residual[edge ^ 1] += flow
+            excess[edge_to[edge]] += flow
+
+    highest, highest_layer = global_relabel()
+    relabels_since_global = 0
+
+    while highest >= 0:
+
+        # Exact heights keep the pushes heading straight for the sink; refresh them once enough relabels have piled up
+        if relabels_since_global >= number_of_nodes:
+            highest, highest_layer = global_relabel()
+            relabels_since_global = 0
+            continue
+
+        if not active[highest]:
+            highest -= 1
+            continue
+        node = active[highest].pop()
+        if excess[node] == 0 or height[node] != highest:
+            continue
+
+        # Discharge the node; push along admissible edges and relabel whenever every edge has been tried
+        edges = adjacency[node]
+        while excess[node] > 0:
+            index = pointer[node]
+
+            if index == len(edges):
+                relabels += 1
+                relabels_since_global += 1
+                old_height = height[node]
+                remove_from_layer(node, old_height)
+
+                # Gap heuristic; nothing is left at old_height so nothing above it can reach the sink any more
+                if layer_head[old_height] < 0:
+                    for level in range(old_height + 1, highest_layer + 1):
+                        other = layer_head[level]
+                        while other >= 0:
+                            height[other] = number_of_nodes
+                            other = layer_next[other]
+                        layer_head[level] = -1
+                    highest_layer = old_height - 1
+                    height[node] = number_of_nodes
+                    break
+
+                new_height = number_of_nodes
+                for edge in edges:
+                    if residual[edge] > 0 and height[edge_to[edge]] + 1 < new_height:
+                        new_height = height[edge_to[edge]] + 1
+                height[node] = new_height
+                pointer[node] = 0
+                if new_height >= number_of_nodes:
+                    break
+                add_to_layer(node, new_height)
+                highest_layer = max(highest_layer, new_height)
+                continue
+
+            edge = edges[index]
+            neighbour = edge_to[edge]
+            if residual[edge] > 0 and height[node] == height[neighbour] + 1:
+                flow = min(excess[node], residual[edge])
+                residual[edge] -= flow
+                residual[edge ^ 1] += flow
+                excess[node] -= flow
+                pushes += 1
+                if excess[neighbour] == 0 and neighbour != sink and neighbour != source:
+                    active[height[neighbour]].append(neighbour)
+                    highest = max(highest, height[neighbour])
+                excess[neighbour] += flow
+            else:
+                pointer[node] += 1
+
+    if instrumentation.counters is not None:
+        instrumentation.record(pushes=pushes, relabels=relabels)
+    return excess[sink]
+
+def find_augmenting_path(graph, source, sink, delta, visited, parent_edge, stamp):
+    ''' An explicit-stack depth-first search for a path from source to sink along edges with at least delta residual capacity.
+        visited is shared between searches; a node counts as visited in this search only when visited[node] == stamp, so the array never has to be cleared.
+    :INPUT:
+        graph: a ResidualGraph to search through.
+        source: the integer ID of the node the search starts from.
+        sink: the integer ID of the node the search is looking for.
+        delta: the smallest residual capacity an edge may have to be followed.
+        visited: a preallocated list of integers, one cell per node.
+        parent_edge: a preallocated list of integers, one cell per node; on success parent_edge[v] is the edge the path used to reach v.
+        stamp: an integer unique to this search.
+    :OUTPUT: True if a path was found, False otherwise.
+    :TIME_COMPLEXITY: O(|V| + |E|), where |V| is the number of nodes and |E| is the number of edges.
+    :SPACE_COMPLEXITY: O(|V|), where |V| is the number of nodes.
+    '''
+    adjacency = graph.adjacency
+    edge_to = graph.edge_to
+    residual = graph.residual
+
+    # The stack replaces the call stack of the recursive dfs so path length is no longer bound by the recursion limit
+    visited[source] = stamp
+    stack = [source]
+    nodes_visited = 0
+    while stack:
+        node = stack.pop()
+        nodes_visited += 1
+        for edge in adjacency[node]:
+            neighbour = edge_to[edge]
+            if residual[edge] >= delta and visited[neighbour] != stamp:
+                visited[neighbour] = stamp
+                parent_edge[neighbour] = edge
+                if neighbour == sink:
+                    if instrumentation.counters is not None:
+                        instrumentation.record(dfs_searches=1, dfs_nodes_visited=nodes_visited, augmenting_paths=1)
+                    return True
+                stack.append(neighbour)
+
+    if instrumentation.counters is not None:
+        instrumentation.record(dfs_searches=1, dfs_nodes_visited=nodes_visited)
+    return False
+
+def augment_along_paths(graph, source, sink, scaling=False):
+    ''' Ford-Fulkerson on a sparse residual graph using the iterative find_augmenting_path search.
+        With scaling the search only follows edges with residual capacity of at least Δ, starting from the largest power of two not above the largest capacity and halving Δ once no such path is left.
+    :INPUT:
+        graph: a ResidualGraph; its residual capacities are updated in place.
+        source: the integer ID of the node the flow leaves from.
+        sink: the integer ID of the node the flow arrives at.
+        scaling: a boolean; True to use capacity scaling.
+    :OUTPUT: maximum_flow; an integer reflecting the flow added from source to sink on top of whatever flow the graph already carried.
+    :TIME_COMPLEXITY: O(|E| · F) without scaling where F is the maximum flow; O(|E|^2 · log U) with scaling where U is the largest capacity.
+    :SPACE_COMPLEXITY: O(|V|), where |V| is the number of nodes.
+    '''
+    edge_to = graph.edge_to
+    residual = graph.residual
+    number_of_nodes = len(graph.adjacency)
+
+    # Allocated once and reused by every search
+    visited = [0] * number_of_nodes
+    parent_edge = [-1] * number_of_nodes
+    stamp = 0
+    maximum_flow = 0
+
+    # Without scaling every edge with any residual capacity at all is followed from the start
+    delta = 1
+    if scaling:
+        largest = max(residual, default=0)
+        while delta * 2 <= largest:
+            delta *= 2
+
+    while delta >= 1:
+        while True:
+            stamp += 1
+            if not find_augmenting_path(graph, source, sink, delta, visited, parent_edge, stamp):
+                break
+
+            # Walk the path back from the sink once to find its bottleneck and once more to push it
+            bottleneck = None
+            node = sink
+            while node != source:
+                edge = parent_edge[node]
+                if bottleneck is None or residual[edge] < bottleneck:
+                    bottleneck = residual[edge]
+                node = edge_to[edge ^ 1]
+
+            node = sink
+            while node != source:
+                edge = parent_edge[node]
+                residual[edge] -= bottleneck
+                residual[edge ^ 1] += bottleneck
+                node = edge_to[edge ^ 1]
+
+            maximum_flow += bottleneck
+
+        delta //= 2
+
+    return maximum_flow
+
+def iterative_dfs(graph, source, sink):
+    ''' Recursion-free augmenting path search; see augment_along_paths. '''
+    return augment_along_paths(graph, source, sink)
+
+def capacity_scaling(graph, source, sink):
+    ''' Recursion-free augmenting path search with capacity scaling; see augment_along_paths. '''
+    return augment_along_paths(graph, source, sink, scaling=True)
+
+
+class ThroughputNetwork:
+    ''' A stateful data centre network that keeps its residual graph and current flow between queries.
+        Changing a channel, a node limit or the set of targets only repairs the flow that is affected and then re-augments from the existing flow rather than solving from zero.
+    '''
+
+    def __init__(self, connections, maxIn, maxOut, origin, targets):
+        ''' Builds the residual graph and solves it once to obtain the starting flow
+        :INPUT:
+            connections: a list of tuple elements (a, b, t) as described in maxThroughput.
+            maxIn:  a list of integers in which maxIn[i] specifies the maximum amount of incoming data that data centre i can process per second.
+            maxOut: a list of integers in which maxOut[i] specifies the maximum amount of outgoing data that data centre i can process per second.
+            origin: the integer ID of the data centre the data is backed up from.
+            targets: a list of integers reflecting the target data centres.
+        :OUTPUT: No Direct Return Output
+        :TIME_COMPLEXITY: O(|D|^2 · |C|), that of a single dinic solve.
+        :SPACE_COMPLEXITY: O(|D| + |C|), where |D| is the number of data centres and |C| is the number of connections.
+        '''
+        number_of_data_centres = len(maxIn)
+        self.maxIn = list(maxIn)  # Copies so that later limit updates do not write into the caller's lists.
+        self.maxOut = list(maxOut)
+        self.origin = origin
+        self.graph = ResidualGraph(number_of_data_centres)
+        self.sink = self.graph.add_node()  # The additional node every target data centre links to.
+        self.channels = {}  # Maps (a, b) to [t, edge]; t is the channel's own throughput before clamping to the node limits.
+        self.node_channels = [[] for _ in range(number_of_data_centres)]  # node_channels[i] lists the (a, b) keys of every channel touching data centre i.
+        self.target_edges = {}  # Maps a data centre to the edge linking it to the sink; kept with zero capacity after the target is removed.
+        self.targets = set()
+        self.visited = [0] * len(self.graph.adjacency)  # Shared by every search run while repairing the flow.
+        self.parent_edge = [-1] * len(self.graph.adjacency)
+        self.stamp = 0
+
+        for from_centre, to_centre, flow in connections:
+            self._set_channel(from_centre, to_centre, flow)
+        for centre_target in targets:
+            self._set_target(centre_target, True)
+
+        self.maximum_flow = dinic(self.graph, self.origin, self.sink)
+
+    def update_channel(self, a, b, t):
+        ''' Changes the throughput of the channel from data centre a to data centre b, creating it if it does not exist yet.
+        :INPUT:
+            a: the integer ID of the data centre the channel departs from.
+            b: the integer ID of the data centre the channel arrives at.
+            t: a non-negative integer reflecting the new maximum throughput of the channel; 0 effectively removes it.
+        :OUTPUT: maximum_flow; an integer reflecting the new maximum throughput from origin to the targets.
+        :TIME_COMPLEXITY: O(|C| · P) where P is the number of paths that have to be cancelled or found again.
+        :SPACE_COMPLEXITY: O(|D|), where |D| is the number of data centres.
+        '''
+        self._set_channel(a, b, t)
+        return self._reaugment()
+
+    def update_node_limits(self, i, max_in, max_out):
+        ''' Changes how much data data centre i can receive and send per second.
+        :INPUT:
+            i: the integer ID of the data centre.
+            max_in: an integer reflecting the new maximum amount of incoming data.
+            max_out: an integer reflecting the new maximum amount of outgoing data.
+        :OUTPUT: maximum_flow; an integer reflecting the new maximum throughput from origin to the targets.
+        :TIME_COMPLEXITY: O(|C| · P) where P is the number of paths that have to be cancelled or found again.
+        :SPACE_COMPLEXITY: O(|D|), where |D| is the number of data centres.
+        '''
+        self.maxIn[i] = max_in
+        self.maxOut[i] = max_out
+
+        # Every channel touching the data centre is clamped by its limits, and so is its link to the sink if it is a target
+        for key in self.node_channels[i]:
+            self._set_channel(key[0], key[1], self.channels[key][0])
+        if i in self.targets:
+            self._set_target(i, True)
+
+        return self._reaugment()
+
+    def add_target(self, i):
+        ''' Adds data centre i to the targets.
+        :INPUT:
+            i: the integer ID of the data centre.
+        :OUTPUT: maximum_flow; an integer reflecting the new maximum throughput from origin to the targets.
+        :TIME_COMPLEXITY: O(|C| · P) where P is the number of new paths found.
+        :SPACE_COMPLEXITY: O(|D|), where |D| is the number of data centres.
+        '''
+        self._set_target(i, True)
+        return self._reaugment()
+
+    def remove_target(self, i):
+        ''' Removes data centre i from the targets.
+        :INPUT:
+            i: the integer ID of the data centre.
+        :OUTPUT: maximum_flow; an integer reflecting the new maximum throughput from origin to the targets.
+        :TIME_COMPLEXITY: O(|C| · P) where P is the number of paths that have to be cancelled or found again.
+        :SPACE_COMPLEXITY: O(|D|), where |D| is the number of data centres.
+        '''
+        self._set_target(i, False)
+        return self._reaugment()
+
+    def _set_channel(self, a, b, t):
+        ''' Records the throughput of channel (a, b) and applies its clamped capacity to the graph without re-augmenting. '''
+        # Channels from a data centre to itself never carry flow; see initialise_residual_graph
+        if a == b:
+            return
+
+        capacity = min(t, self.maxOut[a], self.maxIn[b])
+        key = (a, b)
+        if key in self.channels:
+            self.channels[key][0] = t
+            self._set_capacity(self.channels[key][1], capacity)
+        else:
+            self.channels[key] = [t, self.graph.add_edge(a, b, capacity)]
+            self.node_channels[a].append(key)
+            self.node_channels[b].append(key)
+
+    def _set_target(self, i, linked):
+        ''' Links data centre i to the sink with its clamped capacity, or drops that link to zero, without re-augmenting. '''
+        capacity = min(self.maxIn[i], self.maxOut[i]) if linked else 0
+        if linked:
+            self.targets.add(i)
+        else:
+            self.targets.discard(i)
+
+        if i in self.target_edges:
+            self._set_capacity(self.target_edges[i], capacity)
+        else:
+            self.target_edges[i] = self.graph.add_edge(i, self.sink, capacity)
+
+    def _set_capacity(self, edge, capacity):
+        ''' Changes the capacity of a forward edge, cancelling just enough flow to keep the flow feasible when the capacity drops below it.
+        :INPUT:
+            edge: the integer ID of a forward edge.
+            capacity: a non-negative integer reflecting its new capacity.
+        :OUTPUT: No Direct Return Output
+        :TIME_COMPLEXITY: O(|C| · P) where P is the number of paths the cancelled flow is spread over.
+        :SPACE_COMPLEXITY: O(|D|), where |D| is the number of data centres.
+        '''
+        graph = self.graph
+        flow = graph.capacity[edge] - graph.residual[edge]
+        graph.capacity[edge] = capacity
+
+        # The current flow still fits; only the spare capacity changes
+        if flow <= capacity:
+            graph.residual[edge] = capacity - flow
+            return
+
+        # Cut the flow on the edge down to its new capacity; this leaves its tail with more data coming in than going out and its head with the opposite
+        excess = flow - capacity
+        graph.residual[edge] = 0
+        graph.residual[edge ^ 1] -= excess
+        tail = graph.edge_to[edge ^ 1]
+        head = graph.edge_to[edge]
+
+        # Cheapest repair first; send the excess from tail to head along some other route so the total flow is unchanged
+        excess -= self._push(tail, head, excess)
+
+        # Whatever cannot be rerouted is cancelled; back from the tail to the origin and back from the sink to the head
+        if excess > 0:
+            if tail != self.origin:
+                self._push(tail, self.origin, excess)
+            if head != self.sink:
+                self._push(self.sink, head, excess)
+            self.maximum_flow -= excess
+
+    def _push(self, start, end, amount):
+        ''' Pushes up to amount units of flow from start to end along residual paths; nodes passed through keep their balance, only start and end change.
+        :INPUT:
+            start: the integer ID of the node to push from.
+            end: the integer ID of the node to push to.
+            amount: the most flow to push.
+        :OUTPUT: pushed; an integer reflecting how much flow was actually pushed.
+        :TIME_COMPLEXITY: O(|C| · P) where P is the number of paths used.
+        :SPACE_COMPLEXITY: O(|D|), where |D| is the number of data centres.
+        '''
+        edge_to = self.graph.edge_to
+        residual = self.graph.residual
+        pushed = 0
+
+        while pushed < amount:
+            self.stamp += 1
+            if not find_augmenting_path(self.graph, start, end, 1, self.visited, self.parent_edge, self.stamp):
+                break
+
+            bottleneck = amount - pushed
+            node = end
+            while node != start:
+                edge = self.parent_edge[node]
+                bottleneck = min(bottleneck, residual[edge])
+                node = edge_to[edge ^ 1]
+
+            node = end
+            while node != start:
+                edge = self.parent_edge[node]
+                residual[edge] -= bottleneck
+                residual[edge ^ 1] += bottleneck
+                node = edge_to[edge ^ 1]
+
+            pushed += bottleneck
+
+        return pushed
+
+    def _reaugment(self):
+        ''' Warm-starts dinic from the current flow and returns the new maximum flow. '''
+        self.maximum_flow += dinic(self.graph, self.origin, self.sink)
+        return self.maximum_flow
+
+
+# The sparse maximum flow engines that maxThroughput can be asked to use, keyed by name; 'dfs' is handled separately as it runs on the adjacency matrix
+SOLVERS = {
+    'dinic': dinic,
+    'push_relabel': push_relabel,
+    'iterative_dfs': iterative_dfs,
+    'capacity_scaling': capacity_scaling,
+}
+
+
+def max_throughput_many(topology, queries, workers=1, solver='dinic'):
+    ''' A Driver method to answer many (origin, targets) questions against the same data centre topology.
+        The base residual graph is built once and every query solves on a copy that shares all of its structure and only holds its own residual capacities. With more than one worker the base capacity arrays are placed in shared memory and the queries are spread over a process pool.
+    :INPUT:
+        topology: a tuple (connections, maxIn, maxOut) as described in maxThroughput.
+        queries: a list of tuple elements (origin, targets) as described in maxThroughput.
+        workers: an integer reflecting the number of processes to solve with; 1 solves in this process.
+        solver: the name of the maximum flow engine to use; one of the keys of SOLVERS.
+    :OUTPUT: results; a list of integers, the maximum throughput for every query in the same order as queries.
+    :TIME_COMPLEXITY: O(|C| + Q · S / W) where Q is the number of queries, S the cost of one solve and W the number of workers.
+    :SPACE_COMPLEXITY: O(|D| + |C|) per worker, where |D| is the number of data centres and |C| is the number of connections.
+    '''
+    if solver not in SOLVERS:
+        raise ValueError("unknown solver %r; expected one of %s" % (solver, ', '.join(sorted(SOLVERS))))
+
+    connections, maxIn, maxOut = topology
+    queries = list(queries)
+    base = initialise_base_graph(len(maxIn), connections, maxIn, maxOut)
+
+    if workers <= 1 or len(queries) <= 1:
+        return [solve_on_base(base, origin, targets, solver) for origin, targets in queries]
+
+    # Lay the topology out as one flat block of 64 bit integers; the node count, the edge count, edge_to and the edge capacities
+    # Every worker reads the same pages rather than receiving its own pickled copy
+    number_of_nodes = len(base.adjacency)
+    number_of_edges = len(base.edge_to)
+    flat = array.array('q', [number_of_nodes, number_of_edges])
+    flat.extend(base.edge_to)
+    flat.extend(base.capacity)
+
+    block = shared_memory.SharedMemory(create=True, size=max(len(flat) * flat.itemsize, 1))
+    try:
+        block.buf[:len(flat) * flat.itemsize] = flat.tobytes()
+        with get_context().Pool(workers, initializer=_attach_shared_topology, initargs=(block.name,)) as pool:
+            chunksize = max(1, len(queries) // (workers * 4))
+            return pool.starmap(_solve_shared_query, [(origin, targets, solver) for origin, targets in queries], chunksize)
+    finally:
+        block.close()
+        block.unlink()
+
+def solve_on_base(base, origin, targets, solver='dinic'):
+    ''' Solves a single query on a copy of a base residual graph, leaving the base untouched.
+    :INPUT:
+        base: a ResidualGraph as created by initialise_base_graph.
+        origin: the integer ID of the data centre the data is backed up from.
+        targets: a list of integers reflecting the target data centres.
+        solver: the name of the maximum flow engine to use; one of the keys of SOLVERS.
+    :OUTPUT: maximum_flow; an integer reflecting the maximum throughput from origin to targets.
+    :TIME_COMPLEXITY: O(|D| + |C|) for the copy plus the cost of the solver.
+    :SPACE_COMPLEXITY: O(|D| + |C|), where |D| is the number of data centres and |C| is the number of connections.
+    '''
+    # The sink is the last node; an origin of -1 would be the sink itself and no phase of a solver could ever finish
+    sink = len(base.adjacency) - 1
+    if not 0 <= origin < sink:
+        raise IndexError("origin data centre %r does not exist" % (origin,))
+
+    graph = base.copy()
+    first_sink_edge = len(graph.edge_to) - 2 * sink
+
+    # Close the link to the sink of every data centre, then reopen it to its full capacity for just the targets
+    graph.residual[first_sink_edge::2] = [0] * sink
+    for centre_target in targets:
+        if not 0 <= centre_target < sink:
+            raise IndexError("target data centre %r does not exist" % (centre_target,))
+        edge = first_sink_edge + 2 * centre_target
+        graph.residual[edge] = graph.capacity[edge]
+
+    return SOLVERS[solver](graph, origin, sink)
+
+# The topology a pool worker attached to in _attach_shared_topology; (shared memory block, base graph)
+_shared_topology = None
+
+def _attach_shared_topology(name):
+    ''' Pool initializer; attaches to the shared topology block and rebuilds the adjacency lists once for every query this worker will solve. '''
+    global _shared_topology
+    block = shared_memory.SharedMemory(name=name)
+    flat = block.buf.cast('q')
+    number_of_nodes, number_of_edges = flat[0], flat[1]
+    start = 2
+    edge_to = flat[start:start + number_of_edges].tolist()
+    start += number_of_edges
+
+    # The capacities stay in shared memory; every query copies them straight into its own residual list and nothing else
+    base = ResidualGraph(number_of_nodes)
+    base.edge_to = edge_to
+    base.capacity = flat[start:start + number_of_edges]
+    for edge in range(0, number_of_edges, 2):
+        base.adjacency[edge_to[edge + 1]].append(edge)
+        base.adjacency[edge_to[edge]].append(edge + 1)
+
+    _shared_topology = (block, base)
+
+def _solve_shared_query(origin, targets, solver):
+    ''' Pool task; solves one query against the topology attached by _attach_shared_topology. '''
+    _, base = _shared_topology
+    return solve_on_base(base, origin, targets, solver)
+
+
+class CompactTopology:
+    ''' A compact compressed sparse row (CSR) layout of a data centre topology held in flat typed arrays.
+        The edges leaving data centre u are offsets[u] to offsets[u + 1] - 1; every channel contributes a forward edge and a zero-capacity reverse edge, and reverse[e] is the position of the edge paired with e.
+        The arrays are array.array objects when built in memory, or memoryviews straight onto the file when loaded with mmap.
+    '''
+
+    # Header of the binary layout; magic, version, bytes per integer, byte order (0 little, 1 big), number of data centres, number of edges
+    HEADER = struct.Struct('=8sIBBxxqq')
+    MAGIC = b'DCTOPO\x00\x00'
+    VERSION = 1
+    TYPECODES = {'int32': 'i', 'int64': 'q'}
+
+    def __init__(self, typecode, maxIn, maxOut, offsets, heads, tails, reverse, capacities):
+        ''' Wraps already built CSR arrays; use from_connections or load to create one.
+        :INPUT:
+            typecode: 'i' for 32 bit or 'q' for 64 bit integers; the type of every array.
+            maxIn, maxOut: the node limits as described in maxThroughput.
+            offsets: |D| + 1 integers; the edges leaving data centre u are offsets[u] to offsets[u + 1] - 1.
+            heads: heads[e] is the data centre edge e arrives at.
+            tails: tails[e] is the data centre edge e departs from.
+            reverse: reverse[e] is the position of the edge paired with e.
+            capacities: capacities[e] is the clamped capacity of edge e; 0 for reverse edges.
+        :OUTPUT: No Direct Return Output
+        :TIME_COMPLEXITY: O(1)
+        :SPACE_COMPLEXITY: O(1)
+        '''
+        self.typecode = typecode
+        self.number_of_data_centres = len(maxIn)
+        self.maxIn = maxIn
+        self.maxOut = maxOut
+        self.offsets = offsets
+        self.heads = heads
+        self.tails = tails
+        self.reverse = reverse
+        self.capacities = capacities
+        self.mapping = None  # The mmap object the arrays point into, if loaded with mmap.
+
+    @classmethod
+    def from_connections(cls, connections, maxIn, maxOut, dtype=None):
+        ''' Builds the CSR arrays from a list of connections with a counting sort over the departing data centres.
+        :INPUT:
+            connections: a list of tuple elements (a, b, t) as described in maxThroughput.
+            maxIn:  a list of integers in which maxIn[i] specifies the maximum amount of incoming data that data centre i can process per second.
+            maxOut: a list of integers in which maxOut[i] specifies the maximum amount of outgoing data that data centre i can process per second.
+            dtype: 'int32', 'int64' or None to pick int32 whenever every value fits.
+        :OUTPUT: topology; a CompactTopology.
+        :TIME_COMPLEXITY: O(|D| + |C|), where |D| is the number of data centres and |C| is the number of connections.
+        :SPACE_COMPLEXITY: O(|D| + |C|), where |D| is the number of data centres and |C| is the number of connections.
+        '''
+        number_of_data_centres = len(maxIn)
+
+        # Same clamp and same handling of repeated channels and self loops as initialise_residual_graph
+        channel_capacities = {}
+        for from_centre, to_centre, flow in connections:
+            if from_centre != to_centre:
+                channel_capacities[(from_centre, to_centre)] = min(flow, maxOut[from_centre], maxIn[to_centre])
+        number_of_edges = 2 * len(channel_capacities)
+
+        # Pick the narrowest integer type that holds every capacity, limit and edge position
+        largest = max([number_of_edges, max(maxIn, default=0), max(maxOut, default=0)])
+        if dtype is None:
+            dtype = 'int32' if largest < 2 ** 31 else 'int64'
+        if dtype not in cls.TYPECODES:
+            raise ValueError("unknown dtype %r; expected one of %s" % (dtype, ', '.join(sorted(cls.TYPECODES))))
+        typecode = cls.TYPECODES[dtype]
+        if largest >= 2 ** (8 * array.array(typecode).itemsize - 1):
+            raise ValueError("topology values do not fit in %s" % dtype)
+
+        # Count the edges leaving every data centre, reverse edges included, and turn the counts into row offsets
+        offsets = array.array(typecode, bytes(array.array(typecode).itemsize * (number_of_data_centres + 1)))
+        for from_centre, to_centre in channel_capacities:
+            offsets[from_centre + 1] += 1
+            offsets[to_centre + 1] += 1
+        for centre in range(number_of_data_centres):
+            offsets[centre + 1] += offsets[centre]
+
+        # Drop every edge into the next free slot of its row
+        empty = bytes(array.array(typecode).itemsize * number_of_edges)
+        heads = array.array(typecode, empty)
+        tails = array.array(typecode, empty)
+        reverse = array.array(typecode, empty)
+        capacities = array.array(typecode, empty)
+        position = offsets[:-1]
+        for (from_centre, to_centre), capacity in channel_capacities.items():
+            forward_edge = position[from_centre]
+            position[from_centre] += 1
+            reverse_edge = position[to_centre]
+            position[to_centre] += 1
+            heads[forward_edge] = to_centre
+            tails[forward_edge] = from_centre
+            capacities[forward_edge] = capacity
+            reverse[forward_edge] = reverse_edge
+            heads[reverse_edge] = from_centre
+            tails[reverse_edge] = to_centre
+            reverse[reverse_edge] = forward_edge
+
+        return cls(typecode, array.array(typecode, maxIn), array.array(typecode, maxOut), offsets, heads, tails, reverse, capacities)
+
+    def save(self, path):
+        ''' Writes the topology in its binary layout; a header followed by maxIn, maxOut, offsets, heads, tails, reverse and capacities, each starting on an 8 byte boundary.
+            The file is written beside path and then moved over it, so processes that have the old file mapped are never disturbed.
+        :INPUT:
+            path: the file path to write to.
+        :OUTPUT: No Direct Return Output
+        :TIME_COMPLEXITY: O(|D| + |C|), where |D| is the number of data centres and |C| is the number of connections.
+        :SPACE_COMPLEXITY: O(1)
+        '''
+        itemsize = array.array(self.typecode).itemsize
+        with atomic_write(path) as file:
+            file.write(self.HEADER.pack(self.MAGIC, self.VERSION, itemsize, sys.byteorder == 'big', self.number_of_data_centres, len(self.heads)))
+            for values in self._arrays():
+                data = memoryview(values).cast('B')
+                file.write(data)
+                file.write(bytes(-len(data) % 8))
+
+    @classmethod
+    def load(cls, path, mmap=True):
+        ''' Reads a topology written by save.
+        :INPUT:
+            path: the file path to read from.
+            mmap: True to map the file and read the arrays in place; False to copy them into memory.
+        :OUTPUT: topology; a CompactTopology.
+        :TIME_COMPLEXITY: O(1) with mmap, O(|D| + |C|) without.
+        :SPACE_COMPLEXITY: O(1) with mmap, O(|D| + |C|) without.
+        '''
+        with open(path, 'rb') as file:
+            if mmap:
+                data = memoryview(mmap_module.mmap(file.fileno(), 0, access=mmap_module.ACCESS_READ))
+            else:
+                data = memoryview(file.read())
+
+        if len(data) < cls.HEADER.size:
+            raise ValueError("%s is not a topology file" % path)
+        magic, version, itemsize, big_endian, number_of_data_centres, number_of_edges = cls.HEADER.unpack_from(data)
+        if magic != cls.MAGIC or version != cls.VERSION:
+            raise ValueError("%s is not a version %d topology file" % (path, cls.VERSION))
+        if big_endian != (sys.byteorder == 'big'):
+            raise ValueError("%s was written on a machine with the other byte order" % path)
+        if itemsize not in (4, 8):
+            raise ValueError("%s stores %d byte integers; only 4 and 8 are supported" % (path, itemsize))
+        typecode = 'i' if itemsize == 4 else 'q'
+
+        # Slice every array out of the file in the order save wrote them
+        arrays = []
+        start = cls.HEADER.size
+        for length in (number_of_data_centres, number_of_data_centres, number_of_data_centres + 1,
+                       number_of_edges, number_of_edges, number_of_edges, number_of_edges):
+            if length < 0 or start + length * itemsize > len(data):
+                raise ValueError("%s is truncated" % path)
+            view = data[start:start + length * itemsize]
+            if mmap:
+                arrays.append(view.cast(typecode))
+            else:
+                values = array.array(typecode)
+                values.frombytes(view)
+                arrays.append(values)
+            start += length * itemsize + (-length * itemsize % 8)
+
+        topology = cls(typecode, *arrays)
+        if mmap:
+            topology.mapping = data.obj
+        return topology
+
+    def _arrays(self):
+        ''' The arrays in the order the binary layout stores them. '''
+        return (self.maxIn, self.maxOut, self.offsets, self.heads, self.tails, self.reverse, self.capacities)
+
+def dinic_csr(topology, origin, targets):
+    ''' Dinic's maximum flow algorithm reading straight from the arrays of a CompactTopology.
+        The capacities are copied once into a residual array of the same type. The additional sink node is never materialised; a data centre in targets simply has one more edge, whose residual capacity is kept in to_sink.
+    :INPUT:
+        topology: a CompactTopology; it is only read.
+        origin: the integer ID of the data centre the data is backed up from.
+        targets: a list of integers reflecting the target data centres.
+    :OUTPUT: maximum_flow; an integer reflecting the maximum throughput from origin to targets.
+    :TIME_COMPLEXITY: O(|D|^2 · |C|), where |D| is the number of data centres and |C| is the number of connections.
+    :SPACE_COMPLEXITY: O(|D| + |C|), where |D| is the number of data centres and |C| is the number of connections.
+    '''
+    number_of_data_centres = topology.number_of_data_centres
+    offsets = topology.offsets
+    heads = topology.heads
+    reverse = topology.reverse
+    residual = array.array(topology.typecode)
+    residual.frombytes(memoryview(topology.capacities).cast('B'))
+
+    # The residual capacity of the link from every target to the sink, clamped the same way as link_targets_to_sink
+    to_sink = {}
+    for centre_target in targets:
+        to_sink[centre_target] = min(topology.maxIn[centre_target], topology.maxOut[centre_target])
+
+    maximum_flow = 0
+    phases = 0
+    paths = 0
+    while True:
+
+        # Build the level graph; the sink sits one level below the closest target that can still send to it
+        level = [-1] * number_of_data_centres
+        level[origin] = 0
+        queue = [origin]
+        sink_level = -1
+        for node in queue:
+            if sink_level < 0 and to_sink.get(node, 0) > 0:
+                sink_level = level[node] + 1
+            next_level = level[node] + 1
+            for edge in range(offsets[node], offsets[node + 1]):
+                neighbour = heads[edge]
+                if residual[edge] > 0 and level[neighbour] < 0:
+                    level[neighbour] = next_level
+                    queue.append(neighbour)
+
+        if sink_level < 0:
+            break
+        phases += 1
+
+        # pointer[u] is the first edge of u that may still lead to the sink during this phase; the walk is the same as dinic
+        pointer = offsets[:-1].tolist()
+        path = []
+        node = origin
+
+        while True:
+
+            # The node can finish the path through its link to the sink
+            if level[node] + 1 == sink_level and to_sink.get(node, 0) > 0:
+                bottleneck = min([to_sink[node]] + [residual[edge] for edge in path])
+                for edge in path:
+                    residual[edge] -= bottleneck
+                    residual[reverse[edge]] += bottleneck
+                to_sink[node] -= bottleneck
+                maximum_flow += bottleneck
+                paths += 1
+                path = []
+                node = origin
+                continue
+
+            # Advance along the first admissible edge, one level closer to the sink and never deeper than the last level before it
+            edge = pointer[node]
+            end = offsets[node + 1]
+            next_level = level[node] + 1
+            if next_level < sink_level:
+                while edge < end:
+                    if residual[edge] > 0 and level[heads[edge]] == next_level:
+                        break
+                    edge += 1
+            else:
+                edge = end
+            pointer[node] = edge
+
+            if edge < end:
+                path.append(edge)
+                node = heads[edge]
+                continue
+
+            if node == origin:
+                break
+
+            level[node] = -1
+            edge = path.pop()
+            node = heads[reverse[edge]]
+            pointer[node] += 1
+
+    if instrumentation.counters is not None:
+        instrumentation.record(dinic_phases=phases, augmenting_paths=paths)
+    return maximum_flow
+
+
+if __name__ == '__main__':
+    # Example
+    connections = [(0, 1, 3000), (1, 2, 2000), (1, 3, 1000), (0, 3, 2000), (3, 4, 2000), (3, 2, 1000)]
+    maxIn = [5000, 3000, 3000, 3000, 2000]
+    maxOut = [5000, 3000, 3000, 2500, 1500]
+    origin = 0
+    targets = [4, 2]
+    # Your function should return the maximum possible data throughput from the
+    # data centre origin to the data centres specified in targets.
+    print(maxThroughput(connections, maxIn, maxOut, origin, targets))
+    #4500
 
 
-connections1 = [(182, 235, 785), (2, 47, 629), (144, 210, 255), (82, 122, 420), (108, 215, 327), (116, 64, 531), (161, 37, 304), (189, 27, 614), (23, 25, 373), (4, 51, 671), (18, 23, 137), (208, 175, 317), (180, 109, 189), (67, 234, 315), (225, 49, 115), (4, 93, 405), (68, 0, 238), (123, 31, 596), (130, 19, 195), (158, 5, 438), (211, 67, 344), (235, 86, 635), (125, 28, 797), (230, 44, 501), (157, 67, 564), (181, 189, 688), (104, 68, 490), (39, 159, 688), (196, 144, 420), (229, 62, 166), (177, 48, 162), (34, 5, 557), (192, 207, 562), (70, 170, 89), (127, 57, 729), (60, 151, 383), (63, 41, 95), (10, 39, 383), (79, 80, 418), (217, 15, 789), (26, 88, 714), (2, 30, 657), (148, 136, 168), (122, 144, 194), (223, 105, 641), (205, 4, 349), (21, 152, 259), (188, 119, 611), (44, 71, 507), (184, 194, 176), (220, 162, 578), (189, 229, 679), (173, 99, 335), (105, 116, 574), (238, 17, 410), (55, 156, 572), (72, 13, 116), (154, 221, 472), (112, 23, 732), (22, 128, 582), (103, 28, 770), (62, 144, 638), (145, 43, 291), (207, 50, 409), (124, 208, 427), (166, 51, 146), (139, 156, 237), (162, 54, 707), (59, 1, 513), (146, 85, 241), (109, 26, 377), (150, 221, 231), (138, 46, 687), (35, 192, 676), (54, 110, 555), (26, 203, 117), (102, 115, 644), (233, 79, 105), (160, 39, 580), (191, 23, 371), (197, 36, 129), (121, 37, 246), (1, 172, 199), (80, 88, 104), (100, 185, 549), (28, 38, 799), (97, 134, 686), (174, 107, 618), (33, 73, 782), (155, 48, 734), (50, 62, 567), (84, 213, 376), (185, 30, 170), (57, 223, 339), (86, 104, 619), (126, 47, 643), (92, 23, 470), (165, 61, 669), (154, 218, 352), (185, 228, 170), (127, 152, 369), (45, 127, 112), (16, 190, 157), (207, 216, 671), (20, 200, 681), (192, 84, 662), (159, 47, 288), (110, 27, 768), (164, 92, 305), (194, 98, 448), (31, 208, 308), (201, 31, 648), (15, 226, 344), (132, 186, 137), (176, 190, 165), (12, 23, 102), (202, 201, 721), (12, 55, 292), (69, 99, 477), (134, 207, 543), (59, 227, 152), (156, 171, 707), (172, 73, 537), (227, 158, 454), (25, 190, 154), (81, 176, 581), (168, 187, 206), (83, 211, 241), (52, 41, 543), (87, 60, 486), (25, 19, 409), (136, 42, 331), (203, 78, 387), (237, 64, 108), (29, 96, 84), (120, 207, 256), (42, 65, 682), (193, 226, 538), (84, 175, 88), (163, 93, 537), (170, 39, 467), (221, 210, 567), (218, 50, 187), (40, 211, 334), (64, 42, 599), (74, 110, 169), (43, 56, 237), (182, 112, 619), (206, 84, 408), (67, 90, 329), (232, 41, 116), (88, 110, 394), (41, 16, 783), (48, 8, 799), (8, 72, 426), (108, 18, 642), (114, 68, 156), (37, 224, 474), (224, 113, 280), (95, 148, 791), (72, 3, 690), (177, 142, 258), (198, 58, 247), (91, 35, 774), (73, 224, 417), (107, 50, 234), (222, 148, 437), (236, 14, 750), (216, 132, 679), (40, 29, 716), (99, 91, 698), (100, 36, 169), (66, 44, 182), (119, 236, 318), (109, 223, 380), (140, 158, 323), (14, 184, 520), (27, 158, 436), (19, 221, 653), (219, 40, 128), (3, 106, 166), (214, 76, 113), (94, 234, 702), (13, 79, 697), (115, 221, 700), (7, 131, 411), (17, 56, 643), (90, 24, 679), (6, 57, 419), (133, 101, 433), (216, 215, 697), (137, 3, 233), (53, 28, 87), (49, 59, 784), (24, 238, 514), (93, 32, 780), (135, 70, 632), (187, 18, 245), (215, 170, 287), (147, 160, 309), (0, 206, 430), (30, 199, 702), (32, 25, 447), (89, 58, 96), (149, 104, 788), (143, 87, 755), (56, 120, 390), (209, 20, 465), (25, 185, 392), (11, 189, 778), (91, 53, 537), (183, 47, 577), (46, 85, 512), (65, 10, 142), (195, 133, 144), (20, 44, 240), (204, 40, 688), (234, 203, 269), (226, 89, 285), (212, 83, 584), (169, 124, 181), (167, 25, 440), (85, 81, 460), (75, 2, 523), (106, 159, 359), (142, 225, 639), (141, 32, 400), (186, 138, 749), (231, 139, 322), (128, 85, 367), (121, 59, 328), (178, 57, 131), (199, 19, 75), (153, 4, 80), (71, 133, 338), (131, 163, 93), (200, 23, 654), (101, 49, 107), (190, 119, 585), (78, 180, 180), (113, 176, 625), (96, 49, 451), (127, 51, 223), (51, 217, 160), (210, 107, 222), (118, 29, 716), (151, 102, 692), (58, 185, 778), (173, 56, 792), (117, 97, 217), (129, 81, 566), (174, 219, 675), (36, 227, 674), (77, 42, 252), (173, 94, 785), (137, 111, 648), (9, 229, 570), (61, 132, 705), (47, 212, 790), (171, 105, 629), (111, 81, 772), (5, 162, 558), (179, 174, 172), (167, 179, 365), (228, 200, 587), (76, 155, 526), (152, 216, 474), (38, 155, 482), (175, 215, 222), (166, 124, 607), (213, 204, 356), (216, 232, 445), (98, 210, 190), (55, 214, 95), (52, 153, 760)]
-maxIn1 = [1197, 912, 1029, 1332, 826, 1935, 855, 1759, 1137, 2129, 1005, 1734, 1127, 1834, 1540, 1784, 1043, 1222, 819, 628, 2140, 1336, 2112, 1641, 810, 1466, 1919, 811, 512, 514, 1686, 1509, 1982, 1105, 1066, 504, 2036, 1353, 1332, 1428, 807, 1559, 1008, 762, 1279, 1975, 788, 1412, 754, 799, 555, 605, 1422, 1574, 1976, 1887, 1473, 2018, 1283, 1713, 1875, 1888, 1036, 1392, 592, 1244, 860, 1134, 826, 900, 1331, 1115, 760, 516, 1602, 816, 1299, 842, 582, 1225, 602, 2138, 1290, 1988, 961, 616, 1233, 1067, 1994, 777, 1164, 1561, 2112, 1533, 2078, 1390, 1901, 1421, 584, 1573, 1122, 1278, 1462, 1724, 1202, 710, 777, 649, 2016, 1255, 529, 1329, 1922, 748, 2013, 587, 1464, 650, 1167, 1623, 2115, 1595, 1007, 598, 1718, 1629, 1186, 1253, 1346, 1256, 1003, 977, 787, 663, 1158, 1068, 2160, 1859, 1193, 1190, 2059, 1929, 1831, 1919, 1233, 1733, 1184, 2097, 1997, 1032, 655, 891, 1068, 2129, 1929, 1212, 1079, 1602, 1254, 1884, 841, 803, 1368, 1613, 530, 903, 870, 1212, 1721, 1547, 1820, 1533, 600, 2019, 619, 2003, 723, 1440, 722, 1735, 2122, 1961, 730, 880, 1381, 1808, 1270, 802, 1841, 1966, 757, 2090, 1656, 1149, 1264, 1337, 736, 546, 1719, 917, 1801, 1378, 1998, 1587, 1213, 913, 669, 1444, 562, 2005, 1324, 1584, 1547, 935, 951, 1784, 2032, 1405, 1566, 926, 1870, 629, 1481, 607, 1396, 1673, 1497, 896, 2146, 1131, 640, 1211, 1921, 1154, 645, 1010, 1274, 1044, 1678]
-maxOut1 = [597, 1225, 795, 1668, 1152, 521, 1391, 631, 561, 863, 1171, 1453, 1474, 660, 874, 1660, 906, 1400, 1278, 510, 1368, 1576, 1105, 951, 1359, 1238, 1598, 955, 918, 1575, 921, 795, 626, 703, 1433, 1512, 1612, 1616, 1760, 1675, 1596, 1119, 1395, 1537, 1407, 1133, 1463, 587, 1006, 1543, 1326, 1546, 1518, 668, 949, 899, 1339, 912, 569, 1710, 906, 680, 1435, 749, 1508, 547, 1009, 1327, 892, 1283, 1288, 1061, 826, 1660, 974, 1083, 1004, 1702, 1526, 1032, 751, 635, 1640, 770, 1525, 732, 1285, 1282, 1078, 656, 784, 1747, 913, 502, 775, 1132, 1211, 1500, 1640, 1732, 1579, 1430, 901, 1627, 935, 995, 1379, 1767, 762, 1758, 879, 1297, 1762, 618, 986, 1683, 1761, 870, 1745, 727, 708, 1735, 736, 826, 1522, 1556, 876, 1134, 737, 524, 1428, 874, 835, 692, 1315, 1489, 1279, 770, 644, 1734, 685, 1439, 1356, 1105, 1018, 777, 1379, 783, 763, 1227, 1667, 1320, 1284, 805, 902, 1366, 1257, 1081, 1173, 1700, 699, 739, 549, 1723, 1525, 1291, 1433, 575, 1097, 1570, 1487, 1318, 1419, 1681, 1316, 1728, 846, 1386, 877, 707, 899, 1721, 1619, 831, 1047, 1597, 738, 1217, 712, 876, 1644, 1274, 1577, 1547, 567, 1355, 1053, 671, 963, 593, 1685, 507, 933, 1458, 1182, 1280, 633, 1132, 1270, 710, 1031, 892, 1170, 1735, 1311, 962, 1729, 574, 1527, 988, 658, 1086, 1565, 986, 553, 1605, 1716, 812, 963, 1623, 1049, 1057, 1100, 937, 1554, 1163, 732, 1244, 1580]
-origin1 = 112
-targets1 = [42, 57]
+    connections1 = [(182, 235, 785), (2, 47, 629), (144, 210, 255), (82, 122, 420), (108, 215, 327), (116, 64, 531), (161, 37, 304), (189, 27, 614), (23, 25, 373), (4, 51, 671), (18, 23, 137), (208, 175, 317), (180, 109, 189), (67, 234, 315), (225, 49, 115), (4, 93, 405), (68, 0, 238), (123, 31, 596), (130, 19, 195), (158, 5, 438), (211, 67, 344), (235, 86, 635), (125, 28, 797), (230, 44, 501), (157, 67, 564), (181, 189, 688), (104, 68, 490), (39, 159, 688), (196, 144, 420), (229, 62, 166), (177, 48, 162), (34, 5, 557), (192, 207, 562), (70, 170, 89), (127, 57, 729), (60, 151, 383), (63, 41, 95), (10, 39, 383), (79, 80, 418), (217, 15, 789), (26, 88, 714), (2, 30, 657), (148, 136, 168), (122, 144, 194), (223, 105, 641), (205, 4, 349), (21, 152, 259), (188, 119, 611), (44, 71, 507), (184, 194, 176), (220, 162, 578), (189, 229, 679), (173, 99, 335), (105, 116, 574), (238, 17, 410), (55, 156, 572), (72, 13, 116), (154, 221, 472), (112, 23, 732), (22, 128, 582), (103, 28, 770), (62, 144, 638), (145, 43, 291), (207, 50, 409), (124, 208, 427), (166, 51, 146), (139, 156, 237), (162, 54, 707), (59, 1, 513), (146, 85, 241), (109, 26, 377), (150, 221, 231), (138, 46, 687), (35, 192, 676), (54, 110, 555), (26, 203, 117), (102, 115, 644), (233, 79, 105), (160, 39, 580), (191, 23, 371), (197, 36, 129), (121, 37, 246), (1, 172, 199), (80, 88, 104), (100, 185, 549), (28, 38, 799), (97, 134, 686), (174, 107, 618), (33, 73, 782), (155, 48, 734), (50, 62, 567), (84, 213, 376), (185, 30, 170), (57, 223, 339), (86, 104, 619), (126, 47, 643), (92, 23, 470), (165, 61, 669), (154, 218, 352), (185, 228, 170), (127, 152, 369), (45, 127, 112), (16, 190, 157), (207, 216, 671), (20, 200, 681), (192, 84, 662), (159, 47, 288), (110, 27, 768), (164, 92, 305), (194, 98, 448), (31, 208, 308), (201, 31, 648), (15, 226, 344), (132, 186, 137), (176, 190, 165), (12, 23, 102), (202, 201, 721), (12, 55, 292), (69, 99, 477), (134, 207, 543), (59, 227, 152), (156, 171, 707), (172, 73, 537), (227, 158, 454), (25, 190, 154), (81, 176, 581), (168, 187, 206), (83, 211, 241), (52, 41, 543), (87, 60, 486), (25, 19, 409), (136, 42, 331), (203, 78, 387), (237, 64, 108), (29, 96, 84), (120, 207, 256), (42, 65, 682), (193, 226, 538), (84, 175, 88), (163, 93, 537), (170, 39, 467), (221, 210, 567), (218, 50, 187), (40, 211, 334), (64, 42, 599), (74, 110, 169), (43, 56, 237), (182, 112, 619), (206, 84, 408), (67, 90, 329), (232, 41, 116), (88, 110, 394), (41, 16, 783), (48, 8, 799), (8, 72, 426), (108, 18, 642), (114, 68, 156), (37, 224, 474), (224, 113, 280), (95, 148, 791), (72, 3, 690), (177, 142, 258), (198, 58, 247), (91, 35, 774), (73, 224, 417), (107, 50, 234), (222, 148, 437), (236, 14, 750), (216, 132, 679), (40, 29, 716), (99, 91, 698), (100, 36, 169), (66, 44, 182), (119, 236, 318), (109, 223, 380), (140, 158, 323), (14, 184, 520), (27, 158, 436), (19, 221, 653), (219, 40, 128), (3, 106, 166), (214, 76, 113), (94, 234, 702), (13, 79, 697), (115, 221, 700), (7, 131, 411), (17, 56, 643), (90, 24, 679), (6, 57, 419), (133, 101, 433), (216, 215, 697), (137, 3, 233), (53, 28, 87), (49, 59, 784), (24, 238, 514), (93, 32, 780), (135, 70, 632), (187, 18, 245), (215, 170, 287), (147, 160, 309), (0, 206, 430), (30, 199, 702), (32, 25, 447), (89, 58, 96), (149, 104, 788), (143, 87, 755), (56, 120, 390), (209, 20, 465), (25, 185, 392), (11, 189, 778), (91, 53, 537), (183, 47, 577), (46, 85, 512), (65, 10, 142), (195, 133, 144), (20, 44, 240), (204, 40, 688), (234, 203, 269), (226, 89, 285), (212, 83, 584), (169, 124, 181), (167, 25, 440), (85, 81, 460), (75, 2, 523), (106, 159, 359), (142, 225, 639), (141, 32, 400), (186, 138, 749), (231, 139, 322), (128, 85, 367), (121, 59, 328), (178, 57, 131), (199, 19, 75), (153, 4, 80), (71, 133, 338), (131, 163, 93), (200, 23, 654), (101, 49, 107), (190, 119, 585), (78, 180, 180), (113, 176, 625), (96, 49, 451), (127, 51, 223), (51, 217, 160), (210, 107, 222), (118, 29, 716), (151, 102, 692), (58, 185, 778), (173, 56, 792), (117, 97, 217), (129, 81, 566), (174, 219, 675), (36, 227, 674), (77, 42, 252), (173, 94, 785), (137, 111, 648), (9, 229, 570), (61, 132, 705), (47, 212, 790), (171, 105, 629), (111, 81, 772), (5, 162, 558), (179, 174, 172), (167, 179, 365), (228, 200, 587), (76, 155, 526), (152, 216, 474), (38, 155, 482), (175, 215, 222), (166, 124, 607), (213, 204, 356), (216, 232, 445), (98, 210, 190), (55, 214, 95), (52, 153, 760)]
+    maxIn1 = [1197, 912, 1029, 1332, 826, 1935, 855, 1759, 1137, 2129, 1005, 1734, 1127, 1834, 1540, 1784, 1043, 1222, 819, 628, 2140, 1336, 2112, 1641, 810, 1466, 1919, 811, 512, 514, 1686, 1509, 1982, 1105, 1066, 504, 2036, 1353, 1332, 1428, 807, 1559, 1008, 762, 1279, 1975, 788, 1412, 754, 799, 555, 605, 1422, 1574, 1976, 1887, 1473, 2018, 1283, 1713, 1875, 1888, 1036, 1392, 592, 1244, 860, 1134, 826, 900, 1331, 1115, 760, 516, 1602, 816, 1299, 842, 582, 1225, 602, 2138, 1290, 1988, 961, 616, 1233, 1067, 1994, 777, 1164, 1561, 2112, 1533, 2078, 1390, 1901, 1421, 584, 1573, 1122, 1278, 1462, 1724, 1202, 710, 777, 649, 2016, 1255, 529, 1329, 1922, 748, 2013, 587, 1464, 650, 1167, 1623, 2115, 1595, 1007, 598, 1718, 1629, 1186, 1253, 1346, 1256, 1003, 977, 787, 663, 1158, 1068, 2160, 1859, 1193, 1190, 2059, 1929, 1831, 1919, 1233, 1733, 1184, 2097, 1997, 1032, 655, 891, 1068, 2129, 1929, 1212, 1079, 1602, 1254, 1884, 841, 803, 1368, 1613, 530, 903, 870, 1212, 1721, 1547, 1820, 1533, 600, 2019, 619, 2003, 723, 1440, 722, 1735, 2122, 1961, 730, 880, 1381, 1808, 1270, 802, 1841, 1966, 757, 2090, 1656, 1149, 1264, 1337, 736, 546, 1719, 917, 1801, 1378, 1998, 1587, 1213, 913, 669, 1444, 562, 2005, 1324, 1584, 1547, 935, 951, 1784, 2032, 1405, 1566, 926, 1870, 629, 1481, 607, 1396, 1673, 1497, 896, 2146, 1131, 640, 1211, 1921, 1154, 645, 1010, 1274, 1044, 1678]
+    maxOut1 = [597, 1225, 795, 1668, 1152, 521, 1391, 631, 561, 863, 1171, 1453, 1474, 660, 874, 1660, 906, 1400, 1278, 510, 1368, 1576, 1105, 951, 1359, 1238, 1598, 955, 918, 1575, 921, 795, 626, 703, 1433, 1512, 1612, 1616, 1760, 1675, 1596, 1119, 1395, 1537, 1407, 1133, 1463, 587, 1006, 1543, 1326, 1546, 1518, 668, 949, 899, 1339, 912, 569, 1710, 906, 680, 1435, 749, 1508, 547, 1009, 1327, 892, 1283, 1288, 1061, 826, 1660, 974, 1083, 1004, 1702, 1526, 1032, 751, 635, 1640, 770, 1525, 732, 1285, 1282, 1078, 656, 784, 1747, 913, 502, 775, 1132, 1211, 1500, 1640, 1732, 1579, 1430, 901, 1627, 935, 995, 1379, 1767, 762, 1758, 879, 1297, 1762, 618, 986, 1683, 1761, 870, 1745, 727, 708, 1735, 736, 826, 1522, 1556, 876, 1134, 737, 524, 1428, 874, 835, 692, 1315, 1489, 1279, 770, 644, 1734, 685, 1439, 1356, 1105, 1018, 777, 1379, 783, 763, 1227, 1667, 1320, 1284, 805, 902, 1366, 1257, 1081, 1173, 1700, 699, 739, 549, 1723, 1525, 1291, 1433, 575, 1097, 1570, 1487, 1318, 1419, 1681, 1316, 1728, 846, 1386, 877, 707, 899, 1721, 1619, 831, 1047, 1597, 738, 1217, 712, 876, 1644, 1274, 1577, 1547, 567, 1355, 1053, 671, 963, 593, 1685, 507, 933, 1458, 1182, 1280, 633, 1132, 1270, 710, 1031, 892, 1170, 1735, 1311, 962, 1729, 574, 1527, 988, 658, 1086, 1565, 986, 553, 1605, 1716, 812, 963, 1623, 1049, 1057, 1100, 937, 1554, 1163, 732, 1244, 1580]
+    origin1 = 112
+    targets1 = [42, 57]
 
-#0
-print(maxThroughput(connections1, maxIn1, maxOut1, origin1, targets))
\ No newline at end of file
+    #0
+    print(maxThroughput(connections1, maxIn1, maxOut1, origin1, targets1))
\ No newline at end of file
@@ -1,6 +1,22 @@
+import array
+import heapq
+import mmap as mmap_module
+import struct
+import sys
+import zlib
+from bisect import insort
+from collections import Counter, OrderedDict
+
+import instrumentation
+from atomic_file import atomic_write
+
+
 class Node:
     ''' A singular unit Node class to be used for our Trie data structure that incorporates every potential character '''
 
+    # Slots instead of a per-instance __dict__; a trie holds one Node per distinct prefix so the saving adds up
+    __slots__ = ('child', 'sentence', 'maximum_sentence', 'sentence_end_number', 'maximum_occurrence_number', 'candidates', 'candidate_limit')
+
     def __init__(self):
         ''' 
         Initialises our instance variables for every made Node
@@ -11,16 +27,17 @@ class Node:
         :SPACE_COMPLEXITY: O(1)
         '''
         self.child = 26 * [None]  # We know node can have at most 26 children; where each child represents a potential character from the finite alphabet consisting of 'a' to 'z'.
-        self.child = 26 * [None]  # We know node can have at most 26 children, where each child represents a potential character from the finite alphabet consisting of 'a' to 'z'. 
         self.sentence = None  # To store a potential sentence that could end at some node; helps our autocomplete functionality as it the variable will store the sentence leading to that node. Initialised to None to handle cases where the node does not mark a sentence end.
         self.maximum_sentence = ''  # To store the sentence that occurs most frequently within the subtree rooted from some node.
         self.sentence_end_number = 0  # Counts the number of ending sentences at some node.
         self.maximum_occurrence_number = 0  # Counts the maximum occurrence of a particular sentence within the subtree rooted at some node.
+        self.candidates = []  # The best few sentences within the subtree rooted at some node as (-occurrence, sentence) tuples; sorted so the best comes first.
+        self.candidate_limit = None  # How many candidates this node keeps once a query has asked it for more than the trie's candidate_limit; None to keep the trie's.
 
 class CatsTrie:
     ''' A CatsTrie class that uses our Node class to incorporate cat sentences within a Trie data structure '''
 
-    def __init__(self, sentences):
+    def __init__(self, sentences, bulk=True, candidate_limit=5, cache_size=1024):
         ''' Uses our Node class to initialises our instance variables for every made CatsTrie structure 
             :INPUT: 
                 sentences:  a list of timelines represented as a list of strings with:
@@ -28,16 +45,94 @@ class CatsTrie:
                     The longest sentence would have M characters, as mapped from the cat vocabulary. is a positive integer.
                     A cat word can occur more than once in a single sentence. For example, the string baacbb represents a valid sentence.
                     Assume that there is only a maximum of 26 unique cat words in total, represented as lower case characters from a to z.
+                bulk: True to build the whole trie at once with build_bulk; False to add the sentences one at a time with add_sentence. Both give the same trie.
+                candidate_limit: the number of best sentences every node keeps ready for autoComplete_topk.
+                cache_size: the number of prompts whose autoComplete_topk results are kept cached.
             :OUTPUT: No Direct Return Output
             :TIME_COMPLEXITY: O(NM) time complexity where N is the number of sentence in sentences & M is the number of characters in the longest sentence.
             :SPACE_COMPLEXITY: O(NM) space complexity where N is the number of sentence in sentences & M is the number of characters in the longest sentence.
         '''
         self.root = Node()  # The CatsTrie root
+        self.candidate_limit = candidate_limit  # The most candidates kept at every node.
+        self.cache_size = cache_size
+        self.prompt_cache = OrderedDict()  # Maps a prompt to a dictionary of its autoComplete_topk results by k, least recently used prompt first.
+        self.cache_hits = 0  # Counts the autoComplete_topk calls answered from prompt_cache.
+        self.cache_misses = 0  # Counts the autoComplete_topk calls that had to walk the trie.
+
+        if bulk:
+            self.build_bulk(sentences)
+            return
 
         #  For every sentence within the sentences input; use method add_sentence to add that sentence to our CatsTrie structure
         for sent in sentences:
             self.add_sentence(sent)
 
+    def build_bulk(self, sentences):
+        ''' Builds the whole CatsTrie from an empty root in one pass.
+            Repeated sentences are counted first so each distinct sentence is inserted once. The distinct sentences are then inserted in sorted order, so every sentence shares its path with the previous one up to their common prefix and only the rest needs new nodes.
+            A node is finished as soon as the sorted order moves past its prefix; by then every child has already handed it its best sentence, so comparing its own count settles its maximum_sentence, which it in turn hands to its parent; a single bottom-up pass.
+            :INPUT:
+                sentences:  a list of timelines represented as a list of strings; as described in __init__.
+            :OUTPUT: No Direct Return Output
+            :TIME_COMPLEXITY: O(N log N · M) time complexity for the sort, then O(K) where K is the number of characters across the distinct sentences.
+            :SPACE_COMPLEXITY: O(K) space complexity where K is the number of characters across the distinct sentences.
+        '''
+        counts = Counter(sentences)
+        nodes_created = 0
+
+        # path[i] is the node at depth i along the previous sentence
+        path = [self.root]
+        previous = ''
+        for sentence in sorted(counts):
+
+            # Length of the prefix this sentence shares with the previous one
+            common = 0
+            limit = min(len(previous), len(sentence))
+            while common < limit and previous[common] == sentence[common]:
+                common += 1
+
+            # Nodes below the shared prefix will never be visited again; finish them deepest first
+            while len(path) > common + 1:
+                node = path.pop()
+                self._finish_node(node, path[-1])
+
+            # Sorted order means everything after the shared prefix is new
+            node = path[-1]
+            for character in sentence[common:]:
+                child = Node()
+                node.child[ord(character) - ord('a')] = child
+                path.append(child)
+                node = child
+            nodes_created += len(sentence) - common
+
+            node.sentence_end_number = counts[sentence]
+            node.sentence = sentence
+            previous = sentence
+
+        while len(path) > 1:
+            node = path.pop()
+            self._finish_node(node, path[-1])
+        self._finish_node(self.root, None)
+
+        if instrumentation.counters is not None:
+            instrumentation.record(sentences_added=sum(counts.values()), nodes_created=nodes_created)
+
+    def _finish_node(self, node, parent):
+        ''' Settles the maximum_sentence and candidates of a node whose children are all finished by comparing its own sentence, then hands the results to its parent. '''
+        if node.sentence_end_number > 0:
+            if node.maximum_occurrence_number < node.sentence_end_number or (node.maximum_occurrence_number == node.sentence_end_number and node.maximum_sentence > node.sentence):
+                node.maximum_occurrence_number = node.sentence_end_number
+                node.maximum_sentence = node.sentence
+            self._offer_candidate(node, node.sentence_end_number, node.sentence)
+
+        if parent is not None:
+            if parent.maximum_occurrence_number < node.maximum_occurrence_number or (parent.maximum_occurrence_number == node.maximum_occurrence_number and parent.maximum_sentence > node.maximum_sentence):
+                parent.maximum_occurrence_number = node.maximum_occurrence_number
+                parent.maximum_sentence = node.maximum_sentence
+
+            # Different children never share a sentence, so their candidates simply merge
+            parent.candidates = heapq.nsmallest(self.candidate_limit, parent.candidates + node.candidates)
+
     def add_sentence(self, sentence):
         ''' At a high abstraction level this method adds a sentence to our CatsTrie structure.
             As it adds; every node in the CatsTrie data structure we will keep the sentence that has the smallest lexicographical order seen
@@ -49,6 +144,7 @@ class CatsTrie:
         '''
         # Beginning from our root node
         node = self.root  
+        nodes_created = 0
 
         # Traverse our sentence of interest character by character
         for character in sentence:
@@ -60,6 +156,7 @@ class CatsTrie:
             # Should the child node for this particular character not yet exist; then create a node at that index
             if node.child[index] is None:
                 node.child[index] = Node()
+                nodes_created += 1
 
             # Point to the corresponding child node to that of the current character in iteration; setting up for next iteration where subsequent characters in the sentence are handled
             # Ultimately once every sentence within the input sentences is processed; we will have expanded upon our CatsTrie structure as we map every sentence to a potential pathway through our CatsTrie structure
@@ -95,12 +192,98 @@ class CatsTrie:
                 temp.maximum_occurrence_number = node.sentence_end_number
                 temp.maximum_sentence = node.sentence
 
+            # The candidates at this node may now have to make room for the current sentence
+            self._offer_candidate(temp, node.sentence_end_number, node.sentence)
+
         # Once propagating through the temporary Trie, we perform a similar check at the root node of our self CatsTrie
         # Again if the current sentence's occurrence number is higher than that of the maximum_occurrence_number known to be recorded at the root, 
         # or if they have the same frequency but the current sentence has a smaller lexicographical order; update the root's maximum_occurrence_number and maximum_sentence to reflect that of the current sentence
         if self.root.maximum_occurrence_number < node.sentence_end_number or (self.root.maximum_occurrence_number == node.sentence_end_number and self.root.maximum_sentence > node.sentence):
             self.root.maximum_occurrence_number = node.sentence_end_number
             self.root.maximum_sentence = node.sentence
+        self._offer_candidate(self.root, node.sentence_end_number, node.sentence)
+
+        # Any cached result for a prompt the sentence starts with may have changed; results for every other prompt are untouched
+        for length in range(len(sentence) + 1):
+            self.prompt_cache.pop(sentence[:length], None)
+
+        if instrumentation.counters is not None:
+            instrumentation.record(sentences_added=1, nodes_created=nodes_created)
+
+    def _offer_candidate(self, node, occurrence, sentence):
+        ''' Updates the candidates of a node after a sentence in its subtree reached a new occurrence count.
+            Counts only ever grow, so the new best few are the old best few with this sentence moved up, or let in at the expense of the last one.
+            :INPUT:
+                node: a Node along the path of the sentence.
+                occurrence: the new occurrence count of the sentence.
+                sentence: the sentence.
+            :OUTPUT: No Direct Return Output
+            :TIME_COMPLEXITY: O(K) where K is the candidate limit of the node.
+            :SPACE_COMPLEXITY: O(1)
+        '''
+        limit = self.candidate_limit if node.candidate_limit is None else node.candidate_limit
+        candidates = node.candidates
+        for position, (_, candidate) in enumerate(candidates):
+            if candidate == sentence:
+                del candidates[position]
+                break
+
+        entry = (-occurrence, sentence)
+        if len(candidates) < limit or (candidates and entry < candidates[-1]):
+            insort(candidates, entry)
+            del candidates[limit:]
+
+    def autoComplete_topk(self, prompt, k):
+        ''' Returns the k sentences occurring most often that start with the prompt; ordered by occurrence and then lexicographically.
+            Results are read straight off the candidates of the node the prompt ends at. The first time a node is asked for more than it keeps, its subtree is walked once and its candidate list grows to k, after which add_sentence keeps the longer list up to date like any other.
+            :INPUT:
+                prompt:  is a string with characters in the set of [a...z].
+                k: the most sentences to return.
+            :OUTPUT: a list of at most k strings; empty when no sentence starts with the prompt or k is not positive.
+            :TIME_COMPLEXITY: O(1) on a cache hit; O(X + k) within the candidates the node keeps, and O(X + S) the first time beyond them, where X is the length of the prompt & S the size of its subtree.
+            :SPACE_COMPLEXITY: O(k)
+        '''
+        if k <= 0:
+            return []
+
+        results = self.prompt_cache.get(prompt)
+        if results is not None and k in results:
+            self.cache_hits += 1
+            self.prompt_cache.move_to_end(prompt)
+            return list(results[k])
+        self.cache_misses += 1
+
+        # Walk down to the node the prompt ends at, the same as autoComplete
+        node = self.root
+        for char in prompt:
+            node = node.child[ord(char) - ord('a')]
+            if node is None:
+                break
+
+        if node is None:
+            result = []
+        else:
+            # Deeper than the node's candidates go; gather every sentence ending in the subtree once and keep the best k from now on
+            if k > (self.candidate_limit if node.candidate_limit is None else node.candidate_limit):
+                ends = []
+                stack = [node]
+                while stack:
+                    current = stack.pop()
+                    if current.sentence_end_number > 0:
+                        ends.append((-current.sentence_end_number, current.sentence))
+                    stack.extend(child for child in current.child if child is not None)
+                node.candidates = heapq.nsmallest(k, ends)
+                node.candidate_limit = k
+            result = [sentence for _, sentence in node.candidates[:k]]
+
+        if results is None:
+            results = self.prompt_cache[prompt] = {}
+            if len(self.prompt_cache) > self.cache_size:
+                self.prompt_cache.popitem(last=False)
+        else:
+            self.prompt_cache.move_to_end(prompt)
+        results[k] = result
+        return list(result)
 
     def autoComplete(self, prompt):
         ''' Driver method to autocomplete a given prompt based on the Trie.
@@ -127,4 +310,508 @@ class CatsTrie:
             node = node.child[index]
 
         # Return the sentence that has the maximum occurrence that starts with the input prompt
-        return node.maximum_sentence
\ No newline at end of file
+        return node.maximum_sentence
+
+
+    def save(self, path):
+        ''' Writes a snapshot of the trie that load can map straight back in; see CompactCatsTrie.save for the layout.
+            :INPUT:
+                path: the file path to write to.
+            :OUTPUT: No Direct Return Output
+            :TIME_COMPLEXITY: O(K) where K is the number of nodes in the trie.
+            :SPACE_COMPLEXITY: O(K) where K is the number of nodes in the trie.
+        '''
+        CompactCatsTrie.from_trie(self).save(path)
+
+    @staticmethod
+    def load(path, mmap=True, verify=False):
+        ''' Reads a snapshot written by save. The snapshot comes back as a CompactCatsTrie, which answers autoComplete and autoComplete_topk exactly as the saved trie did.
+            :INPUT:
+                path: the file path to read from.
+                mmap: True to map the file and read it in place; False to copy it into memory.
+                verify: True to check the checksum of the whole snapshot before using it; this reads every byte of it.
+            :OUTPUT: a CompactCatsTrie; see CompactCatsTrie.load.
+            :TIME_COMPLEXITY: O(1) with mmap and no verify; otherwise O(B) where B is the size of the snapshot.
+            :SPACE_COMPLEXITY: O(1) with mmap; otherwise O(B) where B is the size of the snapshot.
+        '''
+        return CompactCatsTrie.load(path, mmap, verify)
+
+
+class CompactCatsTrie:
+    ''' A CatsTrie that stores its nodes in flat parallel arrays rather than one Node object per node.
+        Node 0 is the root. The children of a node form a linked list through first_child and next_sibling, so empty child slots cost nothing, and every sentence is stored once in a shared string table that the nodes refer to by integer id.
+    '''
+
+    # Header of the snapshot layout; magic, version, byte order (0 little, 1 big), number of nodes, number of sentences, bytes of sentence text, CRC-32 of everything after the header
+    HEADER = struct.Struct('=8sIB3xqqqI4x')
+    MAGIC = b'CATTRIE\x00'
+    VERSION = 2
+
+    def __init__(self, sentences=(), bulk=True):
+        ''' Initialises the node arrays with just the root and adds every sentence
+            :INPUT:
+                sentences:  a list of timelines represented as a list of strings; as described in CatsTrie.
+                bulk: True to build the whole trie at once with build_bulk; False to add the sentences one at a time with add_sentence.
+            :OUTPUT: No Direct Return Output
+            :TIME_COMPLEXITY: O(NM) time complexity where N is the number of sentence in sentences & M is the number of characters in the longest sentence.
+            :SPACE_COMPLEXITY: O(NM) space complexity where N is the number of sentence in sentences & M is the number of characters in the longest sentence.
+        '''
+        self.first_child = array.array('i', [-1])  # first_child[v] is the first child of node v, or -1 when v is a leaf.
+        self.next_sibling = array.array('i', [-1])  # next_sibling[v] is the next child of the parent of v, or -1 when v is the last one.
+        self.label = array.array('B', [0])  # label[v] is the index of the character on the edge into node v; ord(character) - ord('a').
+        self.best_sentence = array.array('i', [-1])  # best_sentence[v] is the id of the sentence that occurs most often within the subtree of v, or -1 when there is none yet.
+        self.end_sentence = array.array('i', [-1])  # end_sentence[v] is the id of the sentence ending at node v, or -1 when none does.
+        self.sentence_count = array.array('q')  # sentence_count[i] is the number of times sentence i has been added.
+        self.sentences = []  # The shared string table; sentences[i] is the text of sentence i.
+        self.sentence_ids = {}  # Maps the text of a sentence back to its id.
+
+        if bulk:
+            self.build_bulk(sentences)
+            return
+
+        for sent in sentences:
+            self.add_sentence(sent)
+
+    def build_bulk(self, sentences):
+        ''' Builds the whole trie from an empty root in one pass; the same approach as CatsTrie.build_bulk.
+            Inserting in sorted order creates the nodes in preorder, so every child has a larger id than its parent and a single sweep from the last node back to the root finishes every node before its parent.
+            Sentence ids are handed out in sorted order as well, so ties can be broken by comparing ids instead of strings.
+            :INPUT:
+                sentences:  a list of timelines represented as a list of strings; as described in CatsTrie.
+            :OUTPUT: No Direct Return Output
+            :TIME_COMPLEXITY: O(N log N · M) time complexity for the sort, then O(K) where K is the number of characters across the distinct sentences.
+            :SPACE_COMPLEXITY: O(K) space complexity where K is the number of characters across the distinct sentences.
+        '''
+        counts = Counter(sentences)
+        parent = [-1]  # parent[v] is the parent of node v; only needed until the sweep is done.
+        path = [0]
+        previous = ''
+        for sentence in sorted(counts):
+            common = 0
+            limit = min(len(previous), len(sentence))
+            while common < limit and previous[common] == sentence[common]:
+                common += 1
+            del path[common + 1:]
+
+            node = path[-1]
+            for character in sentence[common:]:
+                child = self._new_child(node, ord(character) - ord('a'))
+                parent.append(node)
+                path.append(child)
+                node = child
+
+            sentence_id = len(self.sentences)
+            self.sentences.append(sentence)
+            self.sentence_ids[sentence] = sentence_id
+            self.sentence_count.append(counts[sentence])
+            self.best_sentence[node] = sentence_id
+            self.end_sentence[node] = sentence_id
+            previous = sentence
+
+        # Every node hands its best sentence up to its parent; children always come after their parent so they are done first
+        best_sentence = self.best_sentence
+        sentence_count = self.sentence_count
+        for node in range(len(parent) - 1, 0, -1):
+            best = best_sentence[node]
+            above = best_sentence[parent[node]]
+            if above < 0 or sentence_count[above] < sentence_count[best] or (sentence_count[above] == sentence_count[best] and above > best):
+                best_sentence[parent[node]] = best
+
+        if instrumentation.counters is not None:
+            instrumentation.record(sentences_added=sum(counts.values()), nodes_created=len(parent) - 1)
+
+    def add_sentence(self, sentence):
+        ''' Adds a sentence to the trie and updates the most frequent sentence of every node along its path.
+            :INPUT:
+                sentence:  a subsentence of the input list 'sentences' that is to be added to our structure
+            :OUTPUT: No Direct Return Output
+            :TIME_COMPLEXITY: O(M) time complexity where M is the number of characters in the sentence.
+            :SPACE_COMPLEXITY: O(M) space complexity where M is the number of characters in the sentence.
+        '''
+        # A trie mapped from a snapshot reads its arrays in place and cannot grow
+        if self.sentence_ids is None:
+            raise TypeError("a trie mapped from a snapshot is read-only; load it with mmap=False to add sentences")
+
+        # Walk down from the root, creating any missing node; remember the path so it does not have to be walked a second time
+        node = 0
+        path = [0]
+        nodes_created = 0
+        for character in sentence:
+            index = ord(character) - ord('a')
+            child = self._child(node, index)
+            if child < 0:
+                child = self._new_child(node, index)
+                nodes_created += 1
+            node = child
+            path.append(node)
+
+        # Look the sentence up in the string table, adding it the first time it is seen, and count this occurrence
+        sentence_id = self.sentence_ids.get(sentence)
+        if sentence_id is None:
+            sentence_id = len(self.sentences)
+            self.sentences.append(sentence)
+            self.sentence_ids[sentence] = sentence_id
+            self.sentence_count.append(0)
+            self.end_sentence[node] = sentence_id
+        self.sentence_count[sentence_id] += 1
+        count = self.sentence_count[sentence_id]
+
+        # The same rule as CatsTrie.add_sentence; a higher count wins, and on equal counts the lexicographically smaller sentence wins
+        for node in path:
+            best = self.best_sentence[node]
+            if best < 0 or self.sentence_count[best] < count or (self.sentence_count[best] == count and self.sentences[best] > sentence):
+                self.best_sentence[node] = sentence_id
+
+        if instrumentation.counters is not None:
+            instrumentation.record(sentences_added=1, nodes_created=nodes_created)
+
+    def autoComplete(self, prompt):
+        ''' Driver method to autocomplete a given prompt; returns exactly what CatsTrie.autoComplete would.
+            :INPUT:
+                prompt:  is a string with characters in the set of [a...z].
+            :OUTPUT: the sentence that has the maximum occurrence that starts with the input prompt, or None if no sentence starts with it.
+            :TIME_COMPLEXITY: O(X) time complexity where X is the length of the prompt.
+            :SPACE_COMPLEXITY: O(1)
+        '''
+        node = 0
+        for char in prompt:
+            node = self._child(node, ord(char) - ord('a'))
+            if node < 0:
+                return None
+
+        # Only an empty trie has a node with no best sentence; CatsTrie answers an empty string there
+        best = self.best_sentence[node]
+        return self.sentences[best] if best >= 0 else ''
+
+    def autoComplete_topk(self, prompt, k):
+        ''' Returns the k sentences occurring most often that start with the prompt; exactly what CatsTrie.autoComplete_topk would.
+            The best sentence of a subtree is never beaten by anything inside it, so a best-first search that opens subtrees in the order of their best sentence meets the sentences in answer order and stops after k of them.
+            :INPUT:
+                prompt:  is a string with characters in the set of [a...z].
+                k: the most sentences to return.
+            :OUTPUT: a list of at most k strings; empty when no sentence starts with the prompt or k is not positive.
+            :TIME_COMPLEXITY: O(X + k · C log(k · C)) where X is the length of the prompt & C the number of children of a node, at most 26.
+            :SPACE_COMPLEXITY: O(k · C)
+        '''
+        node = 0
+        for char in prompt:
+            node = self._child(node, ord(char) - ord('a'))
+            if node < 0:
+                return []
+        if k <= 0 or self.best_sentence[node] < 0:
+            return []
+
+        # Heap entries are (-occurrence, sentence, node); node is -1 for a sentence that is ready to be answered and otherwise a subtree still to be opened
+        sentences = self.sentences
+        sentence_count = self.sentence_count
+        best = self.best_sentence[node]
+        heap = [(-sentence_count[best], sentences[best], node)]
+        result = []
+        while heap and len(result) < k:
+            occurrence, sentence, node = heapq.heappop(heap)
+            if node < 0:
+                result.append(sentence)
+                continue
+
+            ending = self.end_sentence[node]
+            if ending >= 0:
+                heapq.heappush(heap, (-sentence_count[ending], sentences[ending], -1))
+            child = self.first_child[node]
+            while child >= 0:
+                best = self.best_sentence[child]
+                heapq.heappush(heap, (-sentence_count[best], sentences[best], child))
+                child = self.next_sibling[child]
+        return result
+
+    @classmethod
+    def from_trie(cls, trie):
+        ''' Copies a CatsTrie into the array layout.
+            :INPUT:
+                trie: a CatsTrie.
+            :OUTPUT: a CompactCatsTrie answering autoComplete and autoComplete_topk exactly as trie does.
+            :TIME_COMPLEXITY: O(K) where K is the number of nodes in the trie.
+            :SPACE_COMPLEXITY: O(K) where K is the number of nodes in the trie.
+        '''
+        compact = cls()
+
+        # First give every sentence ending in the trie its id and count, then point every node at the id of its maximum_sentence
+        stack = [(trie.root, 0)]
+        best = []
+        while stack:
+            node, compact_node = stack.pop()
+            if node.sentence_end_number > 0:
+                compact.end_sentence[compact_node] = len(compact.sentences)
+                compact.sentence_ids[node.sentence] = len(compact.sentences)
+                compact.sentences.append(node.sentence)
+                compact.sentence_count.append(node.sentence_end_number)
+            if node.maximum_occurrence_number > 0:
+                best.append((compact_node, node.maximum_sentence))
+            for index, child in enumerate(node.child):
+                if child is not None:
+                    stack.append((child, compact._new_child(compact_node, index)))
+
+        for compact_node, sentence in best:
+            compact.best_sentence[compact_node] = compact.sentence_ids[sentence]
+        return compact
+
+    def save(self, path):
+        ''' Writes a snapshot of the trie.
+            The layout is a header followed by first_child, next_sibling, label, best_sentence, end_sentence, sentence_count, the offsets of every sentence in the text and finally the UTF-8 text of every sentence back to back; each section starts on an 8 byte boundary.
+            The snapshot is written beside path and then moved over it, so processes that have the old snapshot mapped keep reading it undisturbed.
+            :INPUT:
+                path: the file path to write to.
+            :OUTPUT: No Direct Return Output
+            :TIME_COMPLEXITY: O(K + B) where K is the number of nodes & B the bytes of sentence text.
+            :SPACE_COMPLEXITY: O(B) where B is the bytes of sentence text.
+        '''
+        text = bytearray()
+        text_offsets = array.array('q', [0])
+        for index in range(len(self.sentences)):
+            text += self.sentences[index].encode()
+            text_offsets.append(len(text))
+
+        # Checksum the sections exactly as they will sit in the file, padding included
+        sections = []
+        for values in (self.first_child, self.next_sibling, self.label, self.best_sentence, self.end_sentence, self.sentence_count, text_offsets, text):
+            data = memoryview(values).cast('B')
+            sections.append(data)
+            sections.append(bytes(-len(data) % 8))
+        checksum = 0
+        for data in sections:
+            checksum = zlib.crc32(data, checksum)
+
+        with atomic_write(path) as file:
+            file.write(self.HEADER.pack(self.MAGIC, self.VERSION, sys.byteorder == 'big', len(self.label), len(self.sentences), len(text), checksum))
+            for data in sections:
+                file.write(data)
+
+    @classmethod
+    def load(cls, path, mmap=True, verify=False):
+        ''' Reads a snapshot written by save.
+            With mmap the node arrays and the sentence text are memoryviews onto the mapped file, so nothing is read until a lookup touches it and every process mapping the same file shares one copy through the page cache; such a trie is read-only.
+            :INPUT:
+                path: the file path to read from.
+                mmap: True to map the file and read it in place; False to copy it into memory, giving a trie that can still grow.
+                verify: True to check the checksum of the whole snapshot before using it; off by default since it reads every byte and so undoes the point of mapping the file.
+            :OUTPUT: a CompactCatsTrie.
+            :TIME_COMPLEXITY: O(1) with mmap and no verify; otherwise O(B) where B is the size of the snapshot.
+            :SPACE_COMPLEXITY: O(1) with mmap; otherwise O(B) where B is the size of the snapshot.
+        '''
+        with open(path, 'rb') as file:
+            if mmap:
+                data = memoryview(mmap_module.mmap(file.fileno(), 0, access=mmap_module.ACCESS_READ))
+            else:
+                data = memoryview(file.read())
+
+        if len(data) < cls.HEADER.size:
+            raise ValueError("%s is not a CatsTrie snapshot" % path)
+        magic, version, big_endian, number_of_nodes, number_of_sentences, text_size, checksum = cls.HEADER.unpack_from(data)
+        if magic != cls.MAGIC or version != cls.VERSION:
+            raise ValueError("%s is not a version %d CatsTrie snapshot" % (path, cls.VERSION))
+        if big_endian != (sys.byteorder == 'big'):
+            raise ValueError("%s was written on a machine with the other byte order" % path)
+        if verify and zlib.crc32(data[cls.HEADER.size:]) != checksum:
+            raise ValueError("%s is corrupt; its checksum does not match" % path)
+
+        # Slice every section out of the file in the order save wrote them
+        sections = []
+        start = cls.HEADER.size
+        for typecode, length in (('i', number_of_nodes), ('i', number_of_nodes), ('B', number_of_nodes), ('i', number_of_nodes), ('i', number_of_nodes),
+                                 ('q', number_of_sentences), ('q', number_of_sentences + 1), ('B', text_size)):
+            size = length * array.array(typecode).itemsize
+            if start + size > len(data):
+                raise ValueError("%s is truncated" % path)
+            view = data[start:start + size]
+            if mmap:
+                sections.append(view.cast(typecode))
+            else:
+                values = array.array(typecode)
+                values.frombytes(view)
+                sections.append(values)
+            start += size + (-size % 8)
+
+        trie = cls.__new__(cls)
+        trie.first_child, trie.next_sibling, trie.label, trie.best_sentence, trie.end_sentence, trie.sentence_count, text_offsets, text = sections
+        trie.sentences = SentenceTable(text, text_offsets)
+        trie.sentence_ids = None
+        if not mmap:
+            trie.sentences = list(trie.sentences)
+            trie.sentence_ids = {sentence: sentence_id for sentence_id, sentence in enumerate(trie.sentences)}
+        return trie
+
+    def _child(self, node, index):
+        ''' Returns the child of node along the character index, or -1 when there is none. '''
+        child = self.first_child[node]
+        while child >= 0 and self.label[child] != index:
+            child = self.next_sibling[child]
+        return child
+
+    def _new_child(self, node, index):
+        ''' Appends a new node and links it in as the first child of node. '''
+        child = len(self.label)
+        self.first_child.append(-1)
+        self.next_sibling.append(self.first_child[node])
+        self.label.append(index)
+        self.best_sentence.append(-1)
+        self.end_sentence.append(-1)
+        self.first_child[node] = child
+        return child
+
+
+class RadixNode:
+    ''' A node of the RadixCatsTrie; the edge into it carries a whole run of characters rather than just one '''
+
+    __slots__ = ('children', 'source', 'start', 'end', 'sentence', 'maximum_sentence', 'sentence_end_number', 'maximum_occurrence_number')
+
+    def __init__(self, source, start, end):
+        '''
+        Initialises our instance variables for every made RadixNode
+        :INPUT:
+            source: the shared sentence the edge label is a slice of.
+            start: the index in source where the edge label begins.
+            end: the index in source just past where the edge label ends.
+        :OUTPUT: No Direct Return Output
+        :TIME_COMPLEXITY: O(1)
+        :SPACE_COMPLEXITY: O(1)
+        '''
+        self.children = {}  # Maps the first symbol of each outgoing edge label to the child it leads to; any hashable symbol works, so any alphabet does.
+        self.source = source  # The edge label is source[start:end]; only the reference and the two indices are stored, never a copy.
+        self.start = start
+        self.end = end
+        self.sentence = None  # The sentence that ends at this node, if any.
+        self.maximum_sentence = source[:0] if source is not None else ''  # The sentence that occurs most frequently within the subtree rooted at this node; an empty one of the same type as the sentences until then.
+        self.sentence_end_number = 0  # Counts the number of sentences ending at this node.
+        self.maximum_occurrence_number = 0  # Counts the occurrence of maximum_sentence.
+
+class RadixCatsTrie:
+    ''' A path-compressed (radix) variant of CatsTrie.
+        Chains of nodes with a single child are merged into one edge whose label is a slice of a sentence kept in a shared table, and children are looked up by symbol in a dictionary, so sentences may be any str (any Unicode) or any bytes.
+        autoComplete gives the same answers as CatsTrie.
+    '''
+
+    def __init__(self, sentences):
+        ''' Initialises the root and adds every sentence
+            :INPUT:
+                sentences:  a list of sentences, either all str or all bytes.
+            :OUTPUT: No Direct Return Output
+            :TIME_COMPLEXITY: O(NM) time complexity where N is the number of sentence in sentences & M is the number of characters in the longest sentence.
+            :SPACE_COMPLEXITY: O(N) nodes where N is the number of distinct sentences, plus the shared sentence table.
+        '''
+        self.root = RadixNode(None, 0, 0)  # The root; the edge into it is empty.
+        self.sentences = {}  # The shared table every edge label points into; maps each distinct sentence to the one copy of it that is kept.
+
+        for sent in sentences:
+            self.add_sentence(sent)
+
+    def add_sentence(self, sentence):
+        ''' Adds a sentence, splitting an edge where the sentence leaves it part way, and updates the most frequent sentence along the path.
+            :INPUT:
+                sentence:  the sentence to add.
+            :OUTPUT: No Direct Return Output
+            :TIME_COMPLEXITY: O(M) time complexity where M is the number of characters in the sentence.
+            :SPACE_COMPLEXITY: O(1) new nodes; at most one split and one new leaf.
+        '''
+        sentence = self.sentences.setdefault(sentence, sentence)
+
+        node = self.root
+        path = [node]
+        position = 0
+        nodes_created = 0
+        while position < len(sentence):
+            child = node.children.get(sentence[position])
+
+            # Nothing starts with the rest of the sentence yet; it all becomes the label of one new leaf
+            if child is None:
+                child = RadixNode(sentence, position, len(sentence))
+                node.children[sentence[position]] = child
+                nodes_created += 1
+                path.append(child)
+                position = len(sentence)
+                node = child
+                break
+
+            # Follow the edge as far as it agrees with the sentence; the first symbol is known to match
+            source, start, end = child.source, child.start, child.end
+            matched = 1
+            while start + matched < end and position + matched < len(sentence) and source[start + matched] == sentence[position + matched]:
+                matched += 1
+
+            # The sentence leaves the edge part way along; split it so a node sits where they part
+            if start + matched < end:
+                middle = RadixNode(source, start, start + matched)
+                nodes_created += 1
+                middle.children[source[start + matched]] = child
+                middle.maximum_sentence = child.maximum_sentence
+                middle.maximum_occurrence_number = child.maximum_occurrence_number
+                child.start = start + matched
+                node.children[sentence[position]] = middle
+                child = middle
+
+            node = child
+            path.append(node)
+            position += matched
+
+        node.sentence_end_number += 1
+        node.sentence = sentence
+
+        # The same rule as CatsTrie.add_sentence at every node along the path, root included
+        count = node.sentence_end_number
+        for temp in path:
+            if temp.maximum_occurrence_number < count or (temp.maximum_occurrence_number == count and temp.maximum_sentence > sentence):
+                temp.maximum_occurrence_number = count
+                temp.maximum_sentence = sentence
+
+        if instrumentation.counters is not None:
+            instrumentation.record(sentences_added=1, nodes_created=nodes_created)
+
+    def autoComplete(self, prompt):
+        ''' Driver method to autocomplete a given prompt; returns exactly what CatsTrie.autoComplete would.
+            :INPUT:
+                prompt:  a string of the same kind as the sentences; str or bytes.
+            :OUTPUT: the sentence that has the maximum occurrence that starts with the input prompt, or None if no sentence starts with it.
+            :TIME_COMPLEXITY: O(X) time complexity where X is the length of the prompt, with one dictionary lookup per edge rather than per character.
+            :SPACE_COMPLEXITY: O(X)
+        '''
+        node = self.root
+        position = 0
+        while position < len(prompt):
+            child = node.children.get(prompt[position])
+            if child is None:
+                return None
+
+            # The prompt may end part way along the edge; only compare as much of the label as the prompt has left
+            length = min(child.end - child.start, len(prompt) - position)
+            if not child.source.startswith(prompt[position:position + length], child.start):
+                return None
+
+            node = child
+            position += length
+
+        # Only the root of an empty trie has no sentence yet; answer an empty sentence of the same type as the prompt, as CatsTrie answers ''
+        if node.maximum_occurrence_number == 0:
+            return prompt[:0]
+        return node.maximum_sentence
+
+
+class SentenceTable:
+    ''' A read-only sentence string table over UTF-8 text; sentence i is text[offsets[i]:offsets[i + 1]], decoded only when it is asked for '''
+
+    def __init__(self, text, offsets):
+        ''' Wraps the text and offsets of a snapshot
+            :INPUT:
+                text: a bytes-like object holding the UTF-8 text of every sentence back to back.
+                offsets: a sequence of N + 1 integers where N is the number of sentences.
+            :OUTPUT: No Direct Return Output
+            :TIME_COMPLEXITY: O(1)
+            :SPACE_COMPLEXITY: O(1)
+        '''
+        self.text = text
+        self.offsets = offsets
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, index):
+        if not 0 <= index < len(self):
+            raise IndexError("sentence id out of range")
+        return bytes(self.text[self.offsets[index]:self.offsets[index + 1]]).decode()
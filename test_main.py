@@ -0,0 +1,194 @@
+''' Randomised checks for the maximum flow engines in main.py; run with python -m pytest. '''
+import random
+from multiprocessing import shared_memory
+
+import pytest
+
+from main import CompactTopology, ThroughputNetwork, dinic_csr, initialise_base_graph, max_throughput_many, maxThroughput, solve_on_base
+
+
+def random_network(rng, largest=10):
+    ''' Returns (connections, maxIn, maxOut, origin, targets) for a small random network, repeated channels and self loops included. '''
+    number_of_data_centres = rng.randint(2, largest)
+    connections = [(rng.randrange(number_of_data_centres), rng.randrange(number_of_data_centres), rng.randint(1, 60))
+                   for _ in range(rng.randint(0, 3 * largest))]
+    maxIn = [rng.randint(1, 80) for _ in range(number_of_data_centres)]
+    maxOut = [rng.randint(1, 80) for _ in range(number_of_data_centres)]
+    origin = rng.randrange(number_of_data_centres)
+    targets = rng.sample(range(number_of_data_centres), rng.randint(1, number_of_data_centres))
+    return connections, maxIn, maxOut, origin, targets
+
+def check_flow(network):
+    ''' Asserts that the flow held by a ThroughputNetwork is feasible and that its value is what the network reports. '''
+    graph = network.graph
+    balance = [0] * len(graph.adjacency)
+    for edge in range(0, len(graph.edge_to), 2):
+        assert 0 <= graph.residual[edge] <= graph.capacity[edge]
+        flow = graph.capacity[edge] - graph.residual[edge]
+        balance[graph.edge_to[edge]] += flow
+        balance[graph.edge_to[edge ^ 1]] -= flow
+
+    for node, amount in enumerate(balance):
+        if node not in (network.origin, network.sink):
+            assert amount == 0
+    assert balance[network.sink] == network.maximum_flow
+
+
+@pytest.mark.parametrize('seed', range(4))
+def test_solvers_match_reference(seed):
+    rng = random.Random(seed)
+    for _ in range(150):
+        connections, maxIn, maxOut, origin, targets = random_network(rng)
+        expected = maxThroughput(connections, maxIn, maxOut, origin, targets, solver='dfs')
+        for solver in ('dinic', 'push_relabel', 'iterative_dfs', 'capacity_scaling'):
+            assert maxThroughput(connections, maxIn, maxOut, origin, targets, solver=solver) == expected
+
+@pytest.mark.parametrize('solver', ['iterative_dfs', 'capacity_scaling'])
+def test_chain_deeper_than_recursion_limit(solver):
+    # Far more data centres than the default recursion limit; the recursive dfs could not follow this path at all
+    rng = random.Random(solver)
+    number_of_data_centres = 20000
+    connections = [(centre, centre + 1, rng.randint(50, 800)) for centre in range(number_of_data_centres - 1)]
+    maxIn = [rng.randint(500, 2160) for _ in range(number_of_data_centres)]
+    maxOut = [rng.randint(500, 1770) for _ in range(number_of_data_centres)]
+
+    # A single path; its throughput is its narrowest clamped channel, or the link from the last data centre to the sink
+    expected = min(min(t, maxOut[a], maxIn[b]) for a, b, t in connections)
+    expected = min(expected, maxIn[-1], maxOut[-1])
+    assert maxThroughput(connections, maxIn, maxOut, 0, [number_of_data_centres - 1], solver=solver) == expected
+
+@pytest.mark.parametrize('solver', ['dfs', 'dinic', 'push_relabel', 'iterative_dfs', 'capacity_scaling'])
+@pytest.mark.parametrize('origin', [-1, 5])
+def test_origin_out_of_range_is_rejected(solver, origin):
+    # Index -1 and index |D| are both the additional sink node once the graph is built, so neither may reach a solver
+    connections = [(0, 1, 3000), (1, 2, 2000), (1, 3, 1000), (0, 3, 2000), (3, 4, 2000), (3, 2, 1000)]
+    maxIn = [5000, 3000, 3000, 3000, 2000]
+    maxOut = [5000, 3000, 3000, 2500, 1500]
+    with pytest.raises(IndexError):
+        maxThroughput(connections, maxIn, maxOut, origin, [4, 2], solver=solver)
+
+@pytest.mark.parametrize('seed', range(4))
+def test_throughput_network_matches_fresh_solve(seed):
+    rng = random.Random(seed)
+    for _ in range(60):
+        connections, maxIn, maxOut, origin, targets = random_network(rng)
+        network = ThroughputNetwork(connections, maxIn, maxOut, origin, targets)
+        channels = {(a, b): t for a, b, t in connections}
+        targets = set(targets)
+        number_of_data_centres = len(maxIn)
+
+        # Apply a random mix of updates, checking every answer against a solve of the updated network from scratch
+        for _ in range(12):
+            choice = rng.random()
+            if choice < 0.5:
+                a, b, t = rng.randrange(number_of_data_centres), rng.randrange(number_of_data_centres), rng.randint(0, 60)
+                channels[(a, b)] = t
+                result = network.update_channel(a, b, t)
+            elif choice < 0.75:
+                i = rng.randrange(number_of_data_centres)
+                maxIn[i], maxOut[i] = rng.randint(0, 80), rng.randint(0, 80)
+                result = network.update_node_limits(i, maxIn[i], maxOut[i])
+            elif choice < 0.88:
+                i = rng.randrange(number_of_data_centres)
+                targets.add(i)
+                result = network.add_target(i)
+            else:
+                i = rng.randrange(number_of_data_centres)
+                targets.discard(i)
+                result = network.remove_target(i)
+
+            connections = [(a, b, t) for (a, b), t in channels.items()]
+            expected = maxThroughput(connections, maxIn, maxOut, origin, sorted(targets)) if targets else 0
+            assert result == expected
+            check_flow(network)
+
+@pytest.mark.parametrize('solver', ['dinic', 'push_relabel', 'iterative_dfs', 'capacity_scaling'])
+def test_queries_on_one_base_match_fresh_solves(solver):
+    rng = random.Random(solver)
+    for _ in range(40):
+        connections, maxIn, maxOut, _, _ = random_network(rng)
+        base = initialise_base_graph(len(maxIn), connections, maxIn, maxOut)
+        for _ in range(5):
+            _, _, _, origin, targets = random_network(rng)
+            origin, targets = origin % len(maxIn), [target % len(maxIn) for target in targets]
+            assert solve_on_base(base, origin, targets, solver) == maxThroughput(connections, maxIn, maxOut, origin, targets)
+
+def test_process_pool_matches_single_process():
+    rng = random.Random(11)
+    connections, maxIn, maxOut, _, _ = random_network(rng, largest=30)
+    queries = [(rng.randrange(len(maxIn)), rng.sample(range(len(maxIn)), rng.randint(1, 4))) for _ in range(25)]
+    assert max_throughput_many((connections, maxIn, maxOut), queries, workers=2) == max_throughput_many((connections, maxIn, maxOut), queries, workers=1)
+
+def test_process_pool_error_still_unlinks_shared_memory(monkeypatch):
+    created = []
+
+    class RecordingSharedMemory(shared_memory.SharedMemory):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            if kwargs.get('create'):
+                created.append(self.name)
+
+    monkeypatch.setattr(shared_memory, 'SharedMemory', RecordingSharedMemory)
+    connections = [(0, 1, 30), (1, 2, 20)]
+    with pytest.raises(IndexError):
+        max_throughput_many((connections, [50, 50, 50], [50, 50, 50]), [(0, [2]), (0, [7]), (1, [2])], workers=2)
+
+    assert len(created) == 1
+    with pytest.raises(FileNotFoundError):
+        shared_memory.SharedMemory(name=created[0])
+
+@pytest.mark.parametrize('dtype', [None, 'int32', 'int64'])
+def test_compact_topology_round_trip(dtype, tmp_path):
+    rng = random.Random(dtype)
+    path = tmp_path / 'topology.bin'
+    for _ in range(40):
+        connections, maxIn, maxOut, origin, targets = random_network(rng)
+        expected = maxThroughput(connections, maxIn, maxOut, origin, targets)
+        topology = CompactTopology.from_connections(connections, maxIn, maxOut, dtype=dtype)
+        assert dinic_csr(topology, origin, targets) == expected
+
+        topology.save(path)
+        for mmap in (True, False):
+            loaded = CompactTopology.load(path, mmap=mmap)
+            assert loaded.typecode == topology.typecode
+            for original, restored in zip(topology._arrays(), loaded._arrays()):
+                assert list(original) == list(restored)
+            assert dinic_csr(loaded, origin, targets) == expected
+
+def test_compact_topology_rejects_other_files(tmp_path):
+    path = tmp_path / 'topology.bin'
+    path.write_bytes(b'\x00' * 64)
+    with pytest.raises(ValueError):
+        CompactTopology.load(path)
+
+def test_compact_topology_rejects_truncated_and_unknown_files(tmp_path):
+    path = tmp_path / 'topology.bin'
+    rng = random.Random(3)
+    connections, maxIn, maxOut, _, _ = random_network(rng, largest=30)
+    CompactTopology.from_connections(connections, maxIn, maxOut).save(path)
+    data = path.read_bytes()
+    header = list(CompactTopology.HEADER.unpack_from(data))
+    _, _, itemsize, _, _, number_of_edges = header
+
+    # Cut inside the last section, and cut exactly where it starts
+    for cut in (data[:-40], data[:len(data) - (number_of_edges * itemsize + 7) // 8 * 8]):
+        path.write_bytes(cut)
+        for mmap in (True, False):
+            with pytest.raises(ValueError):
+                CompactTopology.load(path, mmap=mmap)
+
+    # An integer width the loader has no typecode for
+    header[2] = 2
+    path.write_bytes(CompactTopology.HEADER.pack(*header) + data[CompactTopology.HEADER.size:])
+    with pytest.raises(ValueError):
+        CompactTopology.load(path)
+
+def test_compact_topology_save_leaves_mapped_readers_alone(tmp_path):
+    path = tmp_path / 'topology.bin'
+    CompactTopology.from_connections([(0, 1, 30), (1, 2, 20)], [50, 50, 50], [50, 50, 50]).save(path)
+    loaded = CompactTopology.load(path)
+
+    CompactTopology.from_connections([(0, 1, 7)], [9, 9], [9, 9]).save(path)
+    assert dinic_csr(loaded, 0, [2]) == 20
+    assert dinic_csr(CompactTopology.load(path), 0, [1]) == 7
+    assert [entry.name for entry in tmp_path.iterdir()] == ['topology.bin']
@@ -0,0 +1,151 @@
+''' Randomised checks for the tries in q2.py; run with python -m pytest. '''
+import random
+from collections import Counter
+
+import pytest
+
+from q2 import CatsTrie, CompactCatsTrie, RadixCatsTrie
+
+
+def random_sentences(rng):
+    ''' Returns a small random corpus over a few letters, so that sentences share prefixes and repeat. '''
+    alphabet = 'abcdefghijklmnopqrstuvwxyz'[:rng.randint(1, 5)]
+    return [''.join(rng.choice(alphabet) for _ in range(rng.randint(0, 6))) for _ in range(rng.randint(0, 60))], alphabet
+
+def expected_topk(counts, prompt, k):
+    ''' The k sentences starting with prompt that occur most often, ties broken lexicographically; by brute force. '''
+    return [sentence for _, sentence in sorted((-count, sentence) for sentence, count in counts.items() if sentence.startswith(prompt))][:max(k, 0)]
+
+def expected_autocomplete(counts, prompt):
+    ''' What CatsTrie.autoComplete answers, by brute force over any alphabet; an empty trie answers an empty sentence for an empty prompt. '''
+    matches = [(-count, sentence) for sentence, count in counts.items() if sentence.startswith(prompt)]
+    if matches:
+        return min(matches)[1]
+    return prompt[:0] if not counts and not prompt else None
+
+def random_prompts(rng, alphabet):
+    return [''.join(rng.choice(alphabet) for _ in range(rng.randint(0, 3))) for _ in range(20)] + ['z']
+
+
+@pytest.mark.parametrize('seed', range(3))
+def test_topk_matches_brute_force(seed):
+    rng = random.Random(seed)
+    for _ in range(60):
+        sentences, alphabet = random_sentences(rng)
+        trie = CatsTrie(sentences, bulk=rng.random() < 0.5, candidate_limit=rng.randint(0, 4), cache_size=rng.randint(1, 8))
+        counts = Counter(sentences)
+        for prompt in random_prompts(rng, alphabet):
+            if rng.random() < 0.3:
+                sentence = ''.join(rng.choice(alphabet) for _ in range(rng.randint(0, 6)))
+                counts[sentence] += 1
+                trie.add_sentence(sentence)
+            k = rng.randint(-1, 8)
+            assert trie.autoComplete_topk(prompt, k) == expected_topk(counts, prompt, k)
+
+@pytest.mark.parametrize('mmap', [True, False])
+def test_snapshot_round_trip(mmap, tmp_path):
+    rng = random.Random(mmap)
+    path = tmp_path / 'trie.bin'
+    for _ in range(40):
+        sentences, alphabet = random_sentences(rng)
+        trie = CatsTrie(sentences, bulk=rng.random() < 0.5)
+        trie.save(path)
+        loaded = CatsTrie.load(path, mmap=mmap, verify=True)
+        for prompt in random_prompts(rng, alphabet):
+            assert loaded.autoComplete(prompt) == trie.autoComplete(prompt)
+            for k in (1, 3, 10):
+                assert loaded.autoComplete_topk(prompt, k) == trie.autoComplete_topk(prompt, k)
+
+        # Only a trie copied into memory can keep growing, and it has to keep agreeing with the original
+        if mmap:
+            with pytest.raises(TypeError):
+                loaded.add_sentence('a')
+        else:
+            for sentence in random_sentences(rng)[0]:
+                trie.add_sentence(sentence)
+                loaded.add_sentence(sentence)
+            for prompt in random_prompts(rng, alphabet):
+                assert loaded.autoComplete(prompt) == trie.autoComplete(prompt)
+                assert loaded.autoComplete_topk(prompt, 4) == trie.autoComplete_topk(prompt, 4)
+
+def test_compact_trie_matches_catstrie():
+    rng = random.Random(5)
+    for _ in range(60):
+        sentences, alphabet = random_sentences(rng)
+        trie = CatsTrie(sentences)
+        for compact in (CompactCatsTrie(sentences), CompactCatsTrie(sentences, bulk=False), CompactCatsTrie.from_trie(trie)):
+            for prompt in random_prompts(rng, alphabet):
+                for k in (0, 1, 2, 7):
+                    assert compact.autoComplete_topk(prompt, k) == trie.autoComplete_topk(prompt, k)
+
+def test_snapshot_corruption_is_caught(tmp_path):
+    path = tmp_path / 'trie.bin'
+    CatsTrie(['abc', 'abd', 'abc', 'b']).save(path)
+    data = bytearray(path.read_bytes())
+    data[-1] ^= 0xFF
+    path.write_bytes(data)
+    with pytest.raises(ValueError):
+        CatsTrie.load(path, verify=True)
+
+    path.write_bytes(data[:len(data) // 2])
+    with pytest.raises(ValueError):
+        CatsTrie.load(path)
+
+    path.write_bytes(b'\x00' * 64)
+    with pytest.raises(ValueError):
+        CatsTrie.load(path)
+
+def test_saving_over_a_mapped_snapshot_leaves_its_readers_alone(tmp_path):
+    path = tmp_path / 'trie.bin'
+    CatsTrie(['abc', 'abc', 'abd', 'b']).save(path)
+    loaded = CatsTrie.load(path)
+
+    CatsTrie(['z']).save(path)
+    assert loaded.autoComplete('a') == 'abc'
+    assert loaded.autoComplete_topk('ab', 2) == ['abc', 'abd']
+    assert CatsTrie.load(path, verify=True).autoComplete('') == 'z'
+    assert [entry.name for entry in tmp_path.iterdir()] == ['trie.bin']
+
+def test_radix_trie_matches_catstrie():
+    rng = random.Random(9)
+    for _ in range(80):
+        sentences, alphabet = random_sentences(rng)
+        trie = CatsTrie(sentences, bulk=False)
+        radix = RadixCatsTrie(sentences)
+        for prompt in random_prompts(rng, alphabet):
+            if rng.random() < 0.3:
+                sentence = ''.join(rng.choice(alphabet) for _ in range(rng.randint(0, 6)))
+                trie.add_sentence(sentence)
+                radix.add_sentence(sentence)
+            assert radix.autoComplete(prompt) == trie.autoComplete(prompt)
+
+@pytest.mark.parametrize('alphabet', ['aé漢😀 \n', b'\x00a\x7f\x80\xff'], ids=['str', 'bytes'])
+def test_radix_trie_handles_any_alphabet(alphabet):
+    rng = random.Random(repr(alphabet))
+    symbols = [alphabet[index:index + 1] for index in range(len(alphabet))]
+    empty = alphabet[:0]
+
+    def random_sentence(longest):
+        return empty.join(rng.choice(symbols) for _ in range(rng.randint(0, longest)))
+
+    for _ in range(80):
+        sentences = [random_sentence(8) for _ in range(rng.randint(0, 40))]
+        radix = RadixCatsTrie(sentences)
+        counts = Counter(sentences)
+
+        # Short prompts often end part way along a compressed edge
+        for _ in range(25):
+            if rng.random() < 0.3:
+                sentence = random_sentence(8)
+                counts[sentence] += 1
+                radix.add_sentence(sentence)
+            prompt = random_sentence(4)
+            result = radix.autoComplete(prompt)
+            expected = expected_autocomplete(counts, prompt)
+            assert result == expected
+            assert type(result) is type(expected)
+
+def test_empty_radix_trie_answers_the_type_of_the_prompt():
+    assert RadixCatsTrie([]).autoComplete(b'') == b''
+    assert RadixCatsTrie([]).autoComplete('') == ''
+    assert RadixCatsTrie([b'']).autoComplete(b'') == b''
@@ -0,0 +1,79 @@
+''' Checks for the streaming service in throughput_service.py; run with python -m pytest. '''
+import io
+import json
+import random
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+
+from main import maxThroughput
+from throughput_service import _initialise_worker, serve, solve_request, submit_request, topology_key
+
+
+def random_topology(rng):
+    ''' Returns a small random topology in the request format. '''
+    number_of_data_centres = rng.randint(2, 12)
+    return {
+        'connections': [[rng.randrange(number_of_data_centres), rng.randrange(number_of_data_centres), rng.randint(1, 60)] for _ in range(3 * number_of_data_centres)],
+        'maxIn': [rng.randint(1, 80) for _ in range(number_of_data_centres)],
+        'maxOut': [rng.randint(1, 80) for _ in range(number_of_data_centres)],
+    }
+
+def expected_throughput(topology, origin, targets):
+    return maxThroughput(topology['connections'], topology['maxIn'], topology['maxOut'], origin, targets)
+
+
+@pytest.mark.parametrize('workers', [1, 2])
+def test_results_come_out_in_input_order(workers):
+    rng = random.Random(workers)
+    topologies = [random_topology(rng) for _ in range(3)]
+    lines = []
+    expected = []
+    for request_id in range(60):
+        topology = rng.choice(topologies)
+        number_of_data_centres = len(topology['maxIn'])
+        origin = rng.randrange(number_of_data_centres)
+        targets = rng.sample(range(number_of_data_centres), rng.randint(1, number_of_data_centres))
+        lines.append(json.dumps({'id': request_id, 'topology': topology, 'origin': origin, 'targets': targets}) + '\n')
+        expected.append({'id': request_id, 'throughput': expected_throughput(topology, origin, targets)})
+
+    # A small cache and window keep topologies being evicted and sent again while results are still pending
+    output = io.StringIO()
+    serve(lines, output, workers=workers, cache_size=2, window=3)
+    assert [json.loads(line) for line in output.getvalue().splitlines()] == expected
+
+@pytest.mark.parametrize('workers', [1, 2])
+def test_bad_requests_produce_error_records(workers):
+    topology = {'connections': [[0, 1, 30], [1, 2, 20]], 'maxIn': [50, 50, 50], 'maxOut': [50, 50, 50]}
+    lines = [
+        'not json\n',
+        '\n',
+        json.dumps({'id': 'no origin', 'topology': topology, 'targets': [2]}) + '\n',
+        json.dumps({'id': 'negative origin', 'topology': topology, 'origin': -1, 'targets': [2]}) + '\n',
+        json.dumps({'id': 'origin past the end', 'topology': topology, 'origin': 3, 'targets': [2]}) + '\n',
+        json.dumps({'id': 'missing target', 'topology': topology, 'origin': 0, 'targets': [7]}) + '\n',
+        json.dumps({'id': 'fine', 'topology': topology, 'origin': 0, 'targets': [2]}) + '\n',
+    ]
+    output = io.StringIO()
+    serve(lines, output, workers=workers)
+    records = [json.loads(line) for line in output.getvalue().splitlines()]
+
+    assert [record['id'] for record in records] == [None, None, 'negative origin', 'origin past the end', 'missing target', 'fine']
+    assert records[0]['error'].startswith('malformed request')
+    assert records[1]['error'].startswith('malformed request')
+    for record in records[2:5]:
+        assert record['error'].startswith('IndexError')
+    assert records[5] == {'id': 'fine', 'throughput': 20}
+
+def test_hash_only_request_is_resent_with_its_topology():
+    topology = random_topology(random.Random(5))
+    key = topology_key(topology)
+    request = (key, topology, 0, [1], 'dinic')
+
+    # A process that has never built the topology cannot answer from the hash alone
+    _initialise_worker(4)
+    assert solve_request(key, None, 0, [1], 'dinic') is None
+
+    with ProcessPoolExecutor(1, initializer=_initialise_worker, initargs=(4,)) as executor:
+        assert submit_request(executor, request, send_topology=False).result() == expected_throughput(topology, 0, [1])
+        assert submit_request(executor, request, send_topology=False).result() == expected_throughput(topology, 0, [1])
@@ -0,0 +1,226 @@
+''' A streaming throughput service; reads newline-delimited JSON requests and writes one JSON result per line, in the same order.
+
+Every request line is an object of the form
+    {"id": ..., "topology": {"connections": [[a, b, t], ...], "maxIn": [...], "maxOut": [...]}, "origin": o, "targets": [...]}
+where "id" is optional and simply echoed back. Every result line is either {"id": ..., "throughput": n} or {"id": ..., "error": "..."}.
+
+Usage: python throughput_service.py [input.jsonl] [-o output.jsonl] [--workers N]
+'''
+import argparse
+import hashlib
+import json
+import sys
+from collections import OrderedDict, deque
+from concurrent.futures import Future, ProcessPoolExecutor
+
+from main import SOLVERS, initialise_base_graph, solve_on_base
+
+
+class TopologyCache:
+    ''' A least recently used cache of base residual graphs keyed by the content hash of their topology '''
+
+    def __init__(self, capacity):
+        ''' Initialises an empty cache
+        :INPUT:
+            capacity: an integer reflecting the most topologies kept at once.
+        :OUTPUT: No Direct Return Output
+        :TIME_COMPLEXITY: O(1)
+        :SPACE_COMPLEXITY: O(1)
+        '''
+        self.capacity = capacity
+        self.entries = OrderedDict()  # Maps a content hash to its base graph, least recently used first.
+
+    def get(self, key, topology):
+        ''' Returns the base graph for a topology, building it only if its hash has not been seen recently.
+        :INPUT:
+            key: the content hash of the topology.
+            topology: a dictionary with the keys "connections", "maxIn" and "maxOut", or None if the caller only has the hash.
+        :OUTPUT: base; a ResidualGraph as created by main.initialise_base_graph, or None if the topology is not cached and was not given.
+        :TIME_COMPLEXITY: O(1) on a hit, O(|D| + |C|) on a miss.
+        :SPACE_COMPLEXITY: O(|D| + |C|) on a miss, where |D| is the number of data centres and |C| is the number of connections.
+        '''
+        if key in self.entries:
+            self.entries.move_to_end(key)
+            return self.entries[key]
+        if topology is None:
+            return None
+
+        maxIn = topology['maxIn']
+        base = initialise_base_graph(len(maxIn), topology['connections'], maxIn, topology['maxOut'])
+        self.entries[key] = base
+        if len(self.entries) > self.capacity:
+            self.entries.popitem(last=False)
+        return base
+
+def topology_key(topology):
+    ''' Returns the content hash of a topology; equal topologies hash equally however their JSON was spaced. '''
+    text = json.dumps([topology['connections'], topology['maxIn'], topology['maxOut']], separators=(',', ':'))
+    return hashlib.sha256(text.encode()).hexdigest()
+
+# The topology cache of this process; pool workers each keep their own
+_cache = None
+
+def _initialise_worker(cache_size):
+    ''' Pool initializer; gives the worker its own topology cache. '''
+    global _cache
+    _cache = TopologyCache(cache_size)
+
+def solve_request(key, topology, origin, targets, solver):
+    ''' Solves one parsed request against the cached base graph of its topology.
+    :INPUT:
+        key: the content hash of the topology.
+        topology: a dictionary with the keys "connections", "maxIn" and "maxOut", or None to rely on this process having it cached.
+        origin: the integer ID of the data centre the data is backed up from.
+        targets: a list of integers reflecting the target data centres.
+        solver: the name of the maximum flow engine to use; one of the keys of main.SOLVERS.
+    :OUTPUT: maximum_flow; an integer reflecting the maximum throughput from origin to targets, or None if topology was None and is not cached here.
+    :TIME_COMPLEXITY: that of the solver, plus O(|D| + |C|) to build the base graph on a cache miss.
+    :SPACE_COMPLEXITY: O(|D| + |C|), where |D| is the number of data centres and |C| is the number of connections.
+    '''
+    base = _cache.get(key, topology)
+    if base is None:
+        return None
+    return solve_on_base(base, origin, targets, solver)
+
+def submit_request(executor, request, send_topology):
+    ''' Submits a request to a pool of workers set up by _initialise_worker.
+        When the topology is held back and the worker turns out not to have it built, the request is sent again with it straight away, from the callback of the first attempt, rather than once someone waits for the result.
+    :INPUT:
+        executor: a ProcessPoolExecutor.
+        request: a tuple (key, topology, origin, targets, solver) as taken by solve_request.
+        send_topology: False to send only the hash of the topology first.
+    :OUTPUT: a Future for the maximum throughput of the request.
+    :TIME_COMPLEXITY: O(1) here; the solve runs in a worker.
+    :SPACE_COMPLEXITY: O(1)
+    '''
+    key, topology, origin, targets, solver = request
+    outcome = Future()
+
+    def forward(attempt, may_resend):
+        if attempt.cancelled():
+            outcome.cancel()
+        elif attempt.exception() is not None:
+            outcome.set_exception(attempt.exception())
+        elif attempt.result() is None and may_resend:
+            try:
+                executor.submit(solve_request, *request).add_done_callback(lambda attempt: forward(attempt, False))
+            except RuntimeError as error:
+                outcome.set_exception(error)
+        else:
+            outcome.set_result(attempt.result())
+
+    attempt = executor.submit(solve_request, key, topology if send_topology else None, origin, targets, solver)
+    attempt.add_done_callback(lambda attempt: forward(attempt, not send_topology))
+    return outcome
+
+def parse_request(line):
+    ''' Parses one request line into (id, key, topology, origin, targets); raises ValueError or KeyError on a malformed request. '''
+    request = json.loads(line)
+    topology = request['topology']
+    return request.get('id'), topology_key(topology), topology, request['origin'], request['targets']
+
+def serve(input_stream, output_stream, workers=1, solver='dinic', cache_size=16, window=None):
+    ''' Streams requests from input_stream to results on output_stream, flushing after every result.
+        At most window requests are parsed but not yet written at any time, so memory stays bounded however long the stream is.
+        With a pool, a topology is only sent along with the first request for it; later requests send just its hash, and the few that land on a worker that has not built it yet are sent again in full.
+    :INPUT:
+        input_stream: an iterable of request lines.
+        output_stream: a text stream the result lines are written to.
+        workers: an integer reflecting the number of processes to solve with; 1 solves in this process.
+        solver: the name of the maximum flow engine to use; one of the keys of main.SOLVERS.
+        cache_size: an integer reflecting the most topologies each process keeps built.
+        window: an integer reflecting the most requests in flight; defaults to four per worker.
+    :OUTPUT: No Direct Return Output
+    :TIME_COMPLEXITY: O(R · S / W) where R is the number of requests, S the cost of one solve and W the number of workers.
+    :SPACE_COMPLEXITY: O(window · T + cache_size · T) where T is the size of one topology.
+    '''
+    if solver not in SOLVERS:
+        raise ValueError("unknown solver %r; expected one of %s" % (solver, ', '.join(sorted(SOLVERS))))
+    if window is None:
+        window = 4 * workers
+
+    # Solving in this process needs no pool at all; such requests are queued with their answer instead of a future
+    executor = None
+    if workers > 1:
+        executor = ProcessPoolExecutor(workers, initializer=_initialise_worker, initargs=(cache_size,))
+    else:
+        _initialise_worker(cache_size)
+
+    # The hashes of the topologies already sent to the pool, least recently used first; a worker may still have to be sent one again
+    shipped = OrderedDict()
+
+    # Every pending entry is (id, future, result, error); the future holds on to its request in case it has to be sent again in full
+    pending = deque()
+    try:
+        for line in input_stream:
+            if not line.strip():
+                continue
+
+            try:
+                request_id, key, topology, origin, targets = parse_request(line)
+            except (ValueError, KeyError, TypeError) as error:
+                pending.append((None, None, None, "malformed request: %s" % error))
+            else:
+                request = (key, topology, origin, targets, solver)
+                if executor is not None:
+                    send_topology = key not in shipped
+                    shipped[key] = True
+                    shipped.move_to_end(key)
+                    if len(shipped) > cache_size:
+                        shipped.popitem(last=False)
+                    pending.append((request_id, submit_request(executor, request, send_topology), None, None))
+                else:
+                    try:
+                        pending.append((request_id, None, solve_request(*request), None))
+                    except (IndexError, KeyError, TypeError, ValueError) as error:
+                        pending.append((request_id, None, None, "%s: %s" % (type(error).__name__, error)))
+
+            while len(pending) > window:
+                _write_result(output_stream, *pending.popleft())
+
+        while pending:
+            _write_result(output_stream, *pending.popleft())
+    finally:
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
+
+def _write_result(output_stream, request_id, future, result, error):
+    ''' Writes and flushes one result line, waiting on its future first if it was solved in a worker. '''
+    if future is not None:
+        try:
+            result = future.result()
+        except (IndexError, KeyError, TypeError, ValueError) as exception:
+            error = "%s: %s" % (type(exception).__name__, exception)
+
+    if error is None:
+        record = {'id': request_id, 'throughput': result}
+    else:
+        record = {'id': request_id, 'error': error}
+    output_stream.write(json.dumps(record) + '\n')
+    output_stream.flush()
+
+def main(argv=None):
+    ''' Command line entry point; see the module docstring. '''
+    parser = argparse.ArgumentParser(description='Stream maximum throughput requests from newline-delimited JSON.')
+    parser.add_argument('input', nargs='?', default='-', help='request file; - for stdin (default)')
+    parser.add_argument('-o', '--output', default='-', help='result file; - for stdout (default)')
+    parser.add_argument('--workers', type=int, default=1, help='number of solver processes (default 1)')
+    parser.add_argument('--solver', default='dinic', choices=sorted(SOLVERS), help='maximum flow engine (default dinic)')
+    parser.add_argument('--cache-size', type=int, default=16, help='topologies kept built per process (default 16)')
+    parser.add_argument('--window', type=int, default=None, help='most requests in flight (default 4 per worker)')
+    arguments = parser.parse_args(argv)
+
+    input_stream = sys.stdin if arguments.input == '-' else open(arguments.input)
+    output_stream = sys.stdout if arguments.output == '-' else open(arguments.output, 'w')
+    try:
+        serve(input_stream, output_stream, arguments.workers, arguments.solver, arguments.cache_size, arguments.window)
+    finally:
+        if input_stream is not sys.stdin:
+            input_stream.close()
+        if output_stream is not sys.stdout:
+            output_stream.close()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())